@@ -0,0 +1 @@
+# Marks the 'benchmarks' package.
@@ -0,0 +1,108 @@
+"""Memory and lookup benchmarks for the ContentTrie and RadixTrie backends.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_trie --titles 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+from core.search.radix_trie import RadixTrie
+from core.search.trie import ContentTrie
+
+WORDS = [
+    "introduction",
+    "advanced",
+    "data",
+    "structures",
+    "algorithms",
+    "graph",
+    "dynamic",
+    "programming",
+    "linked",
+    "lists",
+    "binary",
+    "search",
+    "trees",
+    "sorting",
+    "hashing",
+    "heaps",
+]
+
+
+def make_titles(count: int, seed: int = 42) -> List[str]:
+    """Generate `count` pseudo-random, realistically long course titles."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 7))) + f" {i}"
+        for i in range(count)
+    ]
+
+
+def insert_each(factory: Callable[[], object]) -> Callable[[List[str]], object]:
+    """Builder that calls insert() once per title."""
+
+    def build(titles: List[str]):
+        trie = factory()
+        for title in titles:
+            trie.insert(title, title)
+        return trie
+
+    return build
+
+
+def bulk_build(titles: List[str]) -> ContentTrie:
+    """Builder that uses the sorted single-pass ContentTrie.from_sorted."""
+    return ContentTrie.from_sorted(((title, title) for title in titles), pause_gc=True)
+
+
+def measure_build(builder: Callable[[List[str]], object], titles: List[str]):
+    """Build a trie and return (trie, seconds, bytes allocated)."""
+    tracemalloc.start()
+    start = timeit.default_timer()
+    trie = builder(titles)
+    elapsed = timeit.default_timer() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return trie, elapsed, current
+
+
+def measure_lookups(trie, prefixes: List[str], limit: int, repeat: int) -> float:
+    """Return mean microseconds per autocomplete call."""
+    total = timeit.timeit(
+        lambda: [trie.autocomplete(p, limit=limit) for p in prefixes],
+        number=repeat,
+    )
+    return total / (repeat * len(prefixes)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    titles = make_titles(args.titles)
+    prefixes = ["", "a", "gr", "data str", "dynamic programming g", "zzz"]
+
+    print(f"{'backend':<12}{'build s':>10}{'memory MiB':>14}{'lookup us':>12}")
+    builders = (
+        ("trie", insert_each(ContentTrie)),
+        ("trie bulk", bulk_build),
+        ("radix", insert_each(RadixTrie)),
+    )
+    for name, builder in builders:
+        trie, seconds, allocated = measure_build(builder, titles)
+        lookup_us = measure_lookups(trie, prefixes, args.limit, args.repeat)
+        print(f"{name:<12}{seconds:>10.2f}{allocated / 2**20:>14.1f}{lookup_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,25 @@ from __future__ import annotations
 
 from typing import Optional
 
+from core.config import CONFIG
 from core.graph.course_graph import CourseGraph
+from core.graph.frontier import CourseFrontier
 from core.models.student import Student
 from core.recommendations.recommendation_engine import RecommendationEngine
-from core.scheduling.sequence_scheduler import SequenceScheduler, SequenceTask
+from core.scheduling.sequence_scheduler import SequenceTask
+from core.scheduling.student_scheduler import StudentScheduler
+from core.search.inverted_index import InvertedIndex
+from core.search.radix_trie import RadixTrie
 from core.search.trie import ContentTrie
+from core.persistence.snapshot import PlatformSnapshot, load_snapshot, save_snapshot
 from core.persistence.storage import seed_example_data
 from core.students.student_service import StudentService
 
 STUDENT_STORAGE_PATH = "data/students.json"
+SEARCH_RESULT_LIMIT = 10
+FUZZY_MAX_EDITS = 2
+# CONFIG keys that shape the built state; a snapshot is only reused if they match
+SNAPSHOT_SETTINGS = ("search_backend", "search_cache_size")
 
 
 class LearningPlatformCLI:
@@ -30,51 +40,107 @@ class LearningPlatformCLI:
     def __init__(self) -> None:
         # Core components
         self.course_graph = CourseGraph()
-        self.trie = ContentTrie()
-        self.scheduler = SequenceScheduler()
+        self.trie = self._create_trie()
+        self.search_index = InvertedIndex()
+        # Each student consumes their own view of the shared course templates
+        self.student_scheduler = StudentScheduler()
         self.recommendation_engine = RecommendationEngine()
 
         # Student service (wraps dict + persistence)
         self.student_service = StudentService(STUDENT_STORAGE_PATH)
+        # Per-student unlocked-course frontiers, built lazily
+        self.frontiers: dict[str, CourseFrontier] = {}
 
-        # Load initial data
+        # Load initial data, restoring the built state from a snapshot when
+        # one matches the catalog
         self.courses = seed_example_data()
-        self._init_courses()
+        if not self._restore_snapshot():
+            self._init_courses()
+            self._write_snapshot()
 
     # ------------------------------------------------------------------ #
     # Initialization helpers
     # ------------------------------------------------------------------ #
 
+    @staticmethod
+    def _create_trie() -> ContentTrie | RadixTrie:
+        """Create the search index selected by CONFIG["search_backend"]."""
+        if CONFIG.get("search_backend") == "radix":
+            return RadixTrie()
+        return ContentTrie(cache_size=CONFIG.get("search_cache_size", 0))
+
     def _init_courses(self) -> None:
-        """Register courses in graph, fill Trie and schedule all sequences."""
+        """Register courses in graph, fill Trie and build course templates."""
         # Example prerequisites mapping: data_structures -> algorithms
         prereq_map: list[tuple[str, str]] = []
         if "data_structures" in self.courses and "algorithms" in self.courses:
             prereq_map.append(("data_structures", "algorithms"))
 
+        trie_items: list[tuple[str, str]] = []
         for course in self.courses.values():
             self.course_graph.add_course(course)
+            # Sequence order shared by every student's schedule
+            self.student_scheduler.add_course(course)
 
-            # Add course title and sequences to Trie
-            self.trie.insert(course.title, course.title)
+            # Collect course title and sequences for the Trie
+            trie_items.append((course.title, course.title))
+            self.search_index.add_document(
+                course.title, course.title, course.description
+            )
             for seq in course.sequences:
-                self.trie.insert(seq.title, f"{course.title} - {seq.title}")
+                label = f"{course.title} - {seq.title}"
+                trie_items.append((seq.title, label))
+                self.search_index.add_document(label, seq.title)
 
-            # Schedule all sequences with priority based on difficulty
-            for seq in course.sequences:
-                task = SequenceTask(
-                    priority=course.difficulty,
-                    course_id=course.id,
-                    sequence_id=seq.id,
-                    duration=seq.duration,
-                )
-                self.scheduler.schedule(task)
+        # Build the Trie in one sorted pass; startup is single-threaded, so
+        # pausing the cyclic GC for the build is safe here
+        self.trie.bulk_insert(trie_items, pause_gc=True)
 
         # Add prerequisites to CourseGraph
         for prereq, course_id in prereq_map:
             if prereq in self.courses and course_id in self.courses:
                 self.course_graph.add_prerequisite(prereq, course_id)
 
+        # Prerequisite checks on enrollment become bitset lookups
+        self.course_graph.enable_closure_index()
+
+    def _restore_snapshot(self) -> bool:
+        """Adopt the graph, indexes and course templates from a snapshot."""
+        path = CONFIG.get("snapshot_path")
+        if not path:
+            return False
+        snapshot = load_snapshot(path, self.courses, self._snapshot_settings())
+        if snapshot is None or not isinstance(snapshot.trie, type(self.trie)):
+            return False
+        self.courses = snapshot.courses
+        self.course_graph = snapshot.course_graph
+        self.trie = snapshot.trie
+        self.search_index = snapshot.search_index
+        self.student_scheduler = snapshot.student_scheduler
+        return True
+
+    def _write_snapshot(self) -> None:
+        """Save the freshly built state for the next startup."""
+        path = CONFIG.get("snapshot_path")
+        if not path:
+            return
+        save_snapshot(
+            path,
+            PlatformSnapshot(
+                courses=self.courses,
+                course_graph=self.course_graph,
+                trie=self.trie,
+                search_index=self.search_index,
+                student_scheduler=self.student_scheduler,
+            ),
+            self._snapshot_settings(),
+        )
+
+    @staticmethod
+    def _snapshot_settings() -> dict[str, object]:
+        """The CONFIG values the built state depends on."""
+        return {key: CONFIG.get(key) for key in SNAPSHOT_SETTINGS}
+
     # ------------------------------------------------------------------ #
     # CLI Loop
     # ------------------------------------------------------------------ #
@@ -158,7 +224,21 @@ class LearningPlatformCLI:
 
     def _search_content(self) -> None:
         prefix = input("Enter keyword or prefix to search: ").strip()
-        results = self.trie.autocomplete(prefix)
+        results = self.trie.autocomplete(prefix, limit=SEARCH_RESULT_LIMIT)
+        if len(results) < SEARCH_RESULT_LIMIT:
+            # Add matches on words in the middle of titles/descriptions
+            for item in self.search_index.search(prefix):
+                if item not in results:
+                    results.append(item)
+            results = results[:SEARCH_RESULT_LIMIT]
+        if not results and isinstance(self.trie, ContentTrie):
+            results = self.trie.search_fuzzy(
+                prefix,
+                max_edits=FUZZY_MAX_EDITS,
+                limit=SEARCH_RESULT_LIMIT,
+            )
+            if results:
+                print("No exact matches. Did you mean:")
         if not results:
             print("No matching content found.")
             return
@@ -222,8 +302,8 @@ class LearningPlatformCLI:
             print("Student has no active course. Enroll them first.")
             return
 
-        # Find the next scheduled sequence for this course
-        next_task = self._dequeue_next_for_course(student.current_course_id)
+        # Find the student's next sequence for this course
+        next_task = self._next_task_for_student(student)
         if next_task is None:
             print("No remaining scheduled sequences for this course.")
             return
@@ -236,6 +316,10 @@ class LearningPlatformCLI:
             f"(estimated duration={next_task.duration})."
         )
 
+        # Build the frontier before recording progress so the courses this
+        # completion unlocks can be reported
+        frontier = self._frontier_for(student)
+
         # Simple deterministic score: length of sequence_id * 10
         score = len(sequence_id) * 10
         student.update_progress(
@@ -243,31 +327,36 @@ class LearningPlatformCLI:
             sequence_id=sequence_id,
             score=score,
         )
+        self.student_scheduler.complete(student.id, course_id, sequence_id)
 
         print(
             f"Sequence '{sequence_id}' completed with score {score}. "
             f"Total progress: {student.progress} sequences."
         )
 
-    def _dequeue_next_for_course(self, course_id: str) -> Optional[SequenceTask]:
-        """
-        Dequeue the next SequenceTask for the given course_id
-        while preserving the schedule for other courses.
-        """
-        temp: list[SequenceTask] = []
-        selected: Optional[SequenceTask] = None
-
-        while not self.scheduler.is_empty():
-            task = self.scheduler.dequeue_next()
-            if task.course_id == course_id and selected is None:
-                selected = task
-                break
-            temp.append(task)
-
-        for task in temp:
-            self.scheduler.schedule(task)
-
-        return selected
+        unlocked = frontier.mark_satisfied(course_id)
+        if unlocked:
+            print("Newly unlocked courses: " + ", ".join(sorted(unlocked)))
+
+    def _frontier_for(self, student: Student) -> CourseFrontier:
+        """Return the student's unlocked-course frontier, building it on first use."""
+        frontier = self.frontiers.get(student.id)
+        if frontier is None:
+            frontier = CourseFrontier.for_student(
+                self.course_graph,
+                self.courses,
+                student.completed_sequences,
+            )
+            self.frontiers[student.id] = frontier
+        return frontier
+
+    def _next_task_for_student(self, student: Student) -> Optional[SequenceTask]:
+        """Return the student's next sequence in their current course."""
+        if not self.student_scheduler.has_student(student.id):
+            self.student_scheduler.load_completed(
+                student.id, student.completed_sequences
+            )
+        return self.student_scheduler.next_for(student.id, student.current_course_id)
 
     def _view_student_history(self) -> None:
         student = self._get_student_by_prompt()
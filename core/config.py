@@ -7,4 +7,7 @@ This file is optional and reserved for future extensions such as:
 """
 CONFIG = {
     "persistence_backend": "json",  # json | sqlite (future)
+    "search_backend": "trie",  # trie | radix
+    "search_cache_size": 256,  # autocomplete LRU entries (trie backend); 0 disables
+    "snapshot_path": "data/platform.snapshot",  # built-state cache; None disables
 }
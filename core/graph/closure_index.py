@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+class ClosureIndex:
+    """
+    Transitive-closure index over a prerequisite DAG.
+
+    Every course gets a dense integer position; its ancestors (all direct and
+    indirect prerequisites) are stored as one Python int used as a bitset,
+    where bit i is set if the course at position i is an ancestor.
+
+    - "All prerequisites of X" is a bitset decode: O(number of ancestors).
+    - "Is A a prerequisite of B" is a single bit test: O(1).
+
+    The index is kept up to date incrementally by CourseGraph when courses
+    and edges are added or removed, so it never needs a full rebuild. The
+    position of a removed course is left as a hole and never reused.
+    """
+
+    def __init__(self) -> None:
+        self._position: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._ancestors: List[int] = []
+
+    @classmethod
+    def build(
+        cls,
+        topo_order: Iterable[str],
+        reverse_graph: Mapping[str, Set[str]],
+    ) -> "ClosureIndex":
+        """
+        Build the index in one pass over a topological order: each course's
+        ancestors are the union of its parents' ancestors and the parents.
+        """
+        index = cls()
+        for course_id in topo_order:
+            index.add_course(course_id)
+            bits = 0
+            for parent in reverse_graph.get(course_id, ()):
+                pos = index._position[parent]
+                bits |= index._ancestors[pos] | (1 << pos)
+            index._ancestors[index._position[course_id]] = bits
+        return index
+
+    def __contains__(self, course_id: str) -> bool:
+        return course_id in self._position
+
+    def add_course(self, course_id: str) -> None:
+        """Assign a position to a new course (no ancestors yet)."""
+        if course_id in self._position:
+            return
+        self._position[course_id] = len(self._ids)
+        self._ids.append(course_id)
+        self._ancestors.append(0)
+
+    def add_edge(
+        self,
+        prereq_id: str,
+        course_id: str,
+        graph: Mapping[str, Set[str]],
+    ) -> None:
+        """
+        Record a new edge prereq_id -> course_id.
+
+        The new ancestor bits are pushed to course_id and its descendants
+        (found through `graph`, the forward adjacency). A branch is pruned as
+        soon as a course already has every new bit, because its descendants
+        then have them too.
+        """
+        pos = self._position[prereq_id]
+        new_bits = self._ancestors[pos] | (1 << pos)
+
+        queue: deque[str] = deque([course_id])
+        while queue:
+            current = queue.popleft()
+            cur_pos = self._position[current]
+            bits = self._ancestors[cur_pos]
+            if bits | new_bits == bits:
+                continue
+            self._ancestors[cur_pos] = bits | new_bits
+            queue.extend(graph.get(current, ()))
+
+    def remove_course(self, course_id: str) -> None:
+        """
+        Forget a course. Its edges must already be gone and its former
+        dependents refreshed, so no bitset still references its position.
+        """
+        pos = self._position.pop(course_id)
+        self._ids[pos] = None
+        self._ancestors[pos] = 0
+
+    def refresh(
+        self,
+        course_ids: Iterable[str],
+        graph: Mapping[str, Set[str]],
+        reverse_graph: Mapping[str, Set[str]],
+        order: Mapping[str, int],
+    ) -> None:
+        """
+        Recompute ancestor bits after edges into `course_ids` were removed.
+
+        Courses are recomputed from their parents in topological order
+        (`order` maps course ID -> position); a course's dependents are only
+        revisited when its own bits changed, so unaffected branches are skipped.
+        """
+        queued = set(course_ids)
+        heap: List[Tuple[int, str]] = [(order[c], c) for c in queued]
+        heapq.heapify(heap)
+        while heap:
+            _, current = heapq.heappop(heap)
+            bits = 0
+            for parent in reverse_graph.get(current, ()):
+                pos = self._position[parent]
+                bits |= self._ancestors[pos] | (1 << pos)
+
+            cur_pos = self._position[current]
+            if bits == self._ancestors[cur_pos]:
+                continue
+            self._ancestors[cur_pos] = bits
+            for child in graph.get(current, ()):
+                if child not in queued:
+                    queued.add(child)
+                    heapq.heappush(heap, (order[child], child))
+
+    def ancestor_bits(self, course_id: str) -> int:
+        """Return the raw ancestor bitset of a course."""
+        return self._ancestors[self._position[course_id]]
+
+    def decode(self, bits: int) -> Set[str]:
+        """Translate a bitset into the set of course IDs it contains."""
+        result: Set[str] = set()
+        while bits:
+            low = bits & -bits
+            result.add(self._ids[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+    def ancestors(self, course_id: str) -> Set[str]:
+        """Return all (direct and indirect) prerequisites of a course."""
+        return self.decode(self.ancestor_bits(course_id))
+
+    def in_bits(self, course_id: str, bits: int) -> bool:
+        """Return True if the course's bit is set in an ancestor bitset."""
+        return bool(bits >> self._position[course_id] & 1)
+
+    def is_ancestor(self, ancestor_id: str, course_id: str) -> bool:
+        """Return True if ancestor_id is a (transitive) prerequisite of course_id."""
+        pos = self._position[ancestor_id]
+        return bool(self.ancestor_bits(course_id) >> pos & 1)
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import sys
 from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Set
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
+from core.graph.closure_index import ClosureIndex
+from core.graph.csr import CSRGraph
 from core.models.course import Course
+from core.models.plan import LearningPlan
 
 
 @dataclass
@@ -18,6 +24,21 @@ class CourseGraph:
         - `graph`      : prereq_id -> set of dependent course_ids
         - `reverse_graph`: course_id -> set of prerequisite course_ids
         - `in_degrees` : course_id -> number of prerequisites
+        - `course_content`: course_id -> content items, an insertion-ordered
+          dict used as an ordered set (values are None)
+
+    Content item strings are interned, and a reverse index maps each item to
+    the courses that contain it (see courses_with_content).
+
+    Optionally (see enable_closure_index) a ClosureIndex of per-course
+    ancestor bitsets is maintained, turning prerequisite queries into
+    bitset lookups.
+
+    A topological order is maintained incrementally (Pearce-Kelly online
+    algorithm): add_prerequisite rejects cycle-forming edges immediately and
+    only reorders the courses between the edge's endpoints, so
+    topological_sort() is a cached read. Removed courses leave holes in the
+    order, compacted once they outnumber the live courses.
 
     This class does NOT perform persistence or I/O.
     """
@@ -26,7 +47,42 @@ class CourseGraph:
     graph: Dict[str, Set[str]] = field(default_factory=dict)
     reverse_graph: Dict[str, Set[str]] = field(default_factory=dict)
     in_degrees: Dict[str, int] = field(default_factory=dict)
-    course_content: Dict[str, List[str]] = field(default_factory=dict)
+    course_content: Dict[str, Dict[str, None]] = field(default_factory=dict)
+    closure_index: Optional[ClosureIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Dynamic topological order: slot -> course_id (None for a removed
+    # course), and course_id -> slot
+    _topo_slots: List[Optional[str]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _topo_position: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _topo_cache: Optional[List[str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Reverse content index: content item -> course_ids containing it
+    _content_courses: Dict[str, Set[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Accept plain lists too; normalize to interned, deduplicated items
+        self.course_content = {
+            course_id: dict.fromkeys(sys.intern(item) for item in items)
+            for course_id, items in self.course_content.items()
+        }
+        for course_id, items in self.course_content.items():
+            for item in items:
+                self._content_courses.setdefault(item, set()).add(course_id)
+
+        # Graphs constructed from existing maps get one full ordering pass
+        if self.courses:
+            self._topo_slots = self._kahn_order()
+            self._topo_position = {
+                course_id: slot for slot, course_id in enumerate(self._topo_slots)
+            }
 
     # ------------------------------------------------------------------ #
     # Course management
@@ -52,7 +108,52 @@ class CourseGraph:
             self.in_degrees[course_id] = 0
 
         if course_id not in self.course_content:
-            self.course_content[course_id] = []
+            self.course_content[course_id] = {}
+
+        if course_id not in self._topo_position:
+            # A new course has no edges yet, so the end of the order is valid
+            self._topo_position[course_id] = len(self._topo_slots)
+            self._topo_slots.append(course_id)
+            self._topo_cache = None
+
+        if self.closure_index is not None:
+            self.closure_index.add_course(course_id)
+
+    def remove_course(self, course_id: str) -> None:
+        """
+        Remove a course together with its prerequisite edges and content.
+
+        Costs time proportional to the course's edges (plus the dependents
+        whose closure actually changes, if the closure index is enabled).
+
+        Raises:
+            KeyError: if course_id is unknown.
+        """
+        self._ensure_course_exists(course_id)
+
+        for prereq_id in self.reverse_graph.pop(course_id, set()):
+            self.graph[prereq_id].discard(course_id)
+        dependents = self.graph.pop(course_id, set())
+        for dependent in dependents:
+            self.reverse_graph[dependent].discard(course_id)
+            self.in_degrees[dependent] -= 1
+
+        del self.courses[course_id]
+        self.in_degrees.pop(course_id, None)
+        for item in self.course_content.pop(course_id, {}):
+            self._unindex_content(item, course_id)
+
+        slot = self._topo_position.pop(course_id)
+        self._topo_slots[slot] = None
+        self._topo_cache = None
+        if len(self._topo_slots) > 2 * len(self._topo_position):
+            self._compact_topo_slots()
+
+        if self.closure_index is not None:
+            self.closure_index.refresh(
+                dependents, self.graph, self.reverse_graph, self._topo_position
+            )
+            self.closure_index.remove_course(course_id)
 
     def _ensure_course_exists(self, course_id: str) -> None:
         if course_id not in self.courses:
@@ -72,6 +173,8 @@ class CourseGraph:
 
         Raises:
             KeyError: if either course is unknown.
+            ValueError: if the edge would create a cycle. The graph is left
+                unchanged.
         """
         self._ensure_course_exists(prereq_id)
         self._ensure_course_exists(course_id)
@@ -84,14 +187,46 @@ class CourseGraph:
 
         # If the edge is new, update structures
         if course_id not in self.graph[prereq_id]:
+            if prereq_id == course_id:
+                raise ValueError(f"Course '{course_id}' cannot require itself.")
+            if self._topo_position[course_id] < self._topo_position[prereq_id]:
+                self._reorder_for_edge(prereq_id, course_id)
+
             self.graph[prereq_id].add(course_id)
             self.reverse_graph[course_id].add(prereq_id)
             self.in_degrees[course_id] = self.in_degrees.get(course_id, 0) + 1
+            if self.closure_index is not None:
+                self.closure_index.add_edge(prereq_id, course_id, self.graph)
 
         # Ensure prereq has entries in maps
         self.in_degrees.setdefault(prereq_id, 0)
         self.reverse_graph.setdefault(prereq_id, set())
 
+    def remove_prerequisite(self, prereq_id: str, course_id: str) -> None:
+        """
+        Remove the edge prereq_id -> course_id.
+
+        The topological order stays valid without changes. With the closure
+        index enabled, only course_id and the dependents whose ancestors
+        actually shrink are recomputed.
+
+        Raises:
+            KeyError: if either course is unknown or the edge does not exist.
+        """
+        self._ensure_course_exists(prereq_id)
+        self._ensure_course_exists(course_id)
+        if course_id not in self.graph.get(prereq_id, ()):
+            raise KeyError(f"Course '{course_id}' does not require '{prereq_id}'.")
+
+        self.graph[prereq_id].discard(course_id)
+        self.reverse_graph[course_id].discard(prereq_id)
+        self.in_degrees[course_id] -= 1
+
+        if self.closure_index is not None:
+            self.closure_index.refresh(
+                [course_id], self.graph, self.reverse_graph, self._topo_position
+            )
+
     def get_prerequisites(self, course_id: str) -> Set[str]:
         """
         Return the direct prerequisites of a course.
@@ -105,12 +240,14 @@ class CourseGraph:
     def find_all_prerequisites(self, course_id: str) -> Set[str]:
         """
         Return all (direct and indirect) prerequisites of a course
-        using BFS over reverse_graph.
+        using BFS over reverse_graph, or the closure index if enabled.
 
         Raises:
             KeyError: if course_id is unknown.
         """
         self._ensure_course_exists(course_id)
+        if self.closure_index is not None:
+            return self.closure_index.ancestors(course_id)
 
         visited: Set[str] = set()
         queue: deque[str] = deque(self.reverse_graph.get(course_id, set()))
@@ -127,16 +264,279 @@ class CourseGraph:
 
         return visited
 
+    def is_prerequisite(self, prereq_id: str, course_id: str) -> bool:
+        """
+        Return True if prereq_id is a direct or indirect prerequisite of course_id.
+
+        O(1) with the closure index enabled, a BFS otherwise.
+
+        Raises:
+            KeyError: if either course is unknown.
+        """
+        self._ensure_course_exists(prereq_id)
+        self._ensure_course_exists(course_id)
+        if self.closure_index is not None:
+            return self.closure_index.is_ancestor(prereq_id, course_id)
+        return prereq_id in self.find_all_prerequisites(course_id)
+
+    def enable_closure_index(self) -> None:
+        """
+        Build the transitive-closure index from the current graph.
+
+        Once enabled, it is updated incrementally by add_course and
+        add_prerequisite, and used by find_all_prerequisites and
+        is_prerequisite.
+
+        Raises:
+            ValueError: if a cycle is detected in the graph.
+        """
+        self.closure_index = ClosureIndex.build(
+            self.topological_sort(), self.reverse_graph
+        )
+
+    # ------------------------------------------------------------------ #
+    # Batch prerequisite queries
+    # ------------------------------------------------------------------ #
+
+    def union_prerequisites(self, course_ids: Iterable[str]) -> Set[str]:
+        """
+        Return every course that is a prerequisite of at least one of the
+        given courses, using one multi-source BFS (or one OR of ancestor
+        bitsets with the closure index enabled).
+
+        Raises:
+            KeyError: if any course_id is unknown.
+        """
+        sources = self._batch_sources(course_ids)
+        if self.closure_index is not None:
+            bits = 0
+            for course_id in sources:
+                bits |= self.closure_index.ancestor_bits(course_id)
+            return self.closure_index.decode(bits)
+
+        visited: Set[str] = set()
+        queue: deque[str] = deque()
+        for course_id in sources:
+            queue.extend(self.reverse_graph.get(course_id, ()))
+        while queue:
+            prereq = queue.popleft()
+            if prereq in visited:
+                continue
+            visited.add(prereq)
+            queue.extend(self.reverse_graph.get(prereq, ()))
+        return visited
+
+    def shared_prerequisites(self, course_ids: Iterable[str]) -> Set[str]:
+        """
+        Return the courses that are prerequisites of every given course
+        (empty if no courses are given).
+
+        Raises:
+            KeyError: if any course_id is unknown.
+        """
+        sources = self._batch_sources(course_ids)
+        if not sources:
+            return set()
+        if self.closure_index is not None:
+            bits = -1
+            for course_id in sources:
+                bits &= self.closure_index.ancestor_bits(course_id)
+            return self.closure_index.decode(bits)
+
+        full = (1 << len(sources)) - 1
+        masks = self._required_by_masks(sources)
+        return {course_id for course_id, mask in masks.items() if mask == full}
+
+    def covering_courses(self, course_ids: Iterable[str]) -> Set[str]:
+        """
+        Return the smallest subset of the given courses that covers all of
+        them: taking these courses (with their prerequisites) includes every
+        given course. These are the given courses that are not a
+        prerequisite of another given course.
+
+        Raises:
+            KeyError: if any course_id is unknown.
+        """
+        sources = self._batch_sources(course_ids)
+        if self.closure_index is not None:
+            bits = 0
+            for course_id in sources:
+                bits |= self.closure_index.ancestor_bits(course_id)
+            return {
+                course_id
+                for course_id in sources
+                if not self.closure_index.in_bits(course_id, bits)
+            }
+
+        masks = self._required_by_masks(sources)
+        return {course_id for course_id in sources if not masks.get(course_id)}
+
+    def _batch_sources(self, course_ids: Iterable[str]) -> List[str]:
+        sources = list(dict.fromkeys(course_ids))
+        for course_id in sources:
+            self._ensure_course_exists(course_id)
+        return sources
+
+    def _required_by_masks(self, sources: List[str]) -> Dict[str, int]:
+        """
+        Map each course to a bitmask of the sources (bit i = sources[i]) it is
+        a direct or indirect prerequisite of.
+
+        One pass over the topological order in reverse: a course's mask is
+        pushed to its prerequisites together with its own source bit. Courses
+        no source depends on are skipped without touching their edges.
+        """
+        seeds = {course_id: 1 << i for i, course_id in enumerate(sources)}
+        masks: Dict[str, int] = {}
+        for course_id in reversed(self._topo_slots):
+            if course_id is None:
+                continue
+            carried = masks.get(course_id, 0) | seeds.get(course_id, 0)
+            if not carried:
+                continue
+            for parent in self.reverse_graph.get(course_id, ()):
+                masks[parent] = masks.get(parent, 0) | carried
+        return masks
+
     # ------------------------------------------------------------------ #
     # Topological sort
     # ------------------------------------------------------------------ #
 
     def topological_sort(self) -> List[str]:
         """
-        Perform a topological sort of all registered courses.
+        Return a topological order of all registered courses.
+
+        The order is maintained incrementally by add_course/add_prerequisite,
+        so this is a cached read rather than a full recomputation.
 
         Returns:
             A list of course IDs in an order that respects prerequisites.
+        """
+        if self._topo_cache is None:
+            self._topo_cache = [c for c in self._topo_slots if c is not None]
+        return list(self._topo_cache)
+
+    def topological_layers(self) -> List[List[str]]:
+        """
+        Group courses into dependency generations (antichains).
+
+        Layer 0 holds courses without prerequisites; every other course sits
+        one layer after its deepest prerequisite, so courses in the same layer
+        never depend on each other. Computed in one pass over the cached
+        topological order.
+        """
+        depth: Dict[str, int] = {}
+        layers: List[List[str]] = []
+        for course_id in self.topological_sort():
+            level = 1 + max(
+                (depth[parent] for parent in self.reverse_graph.get(course_id, ())),
+                default=-1,
+            )
+            depth[course_id] = level
+            if level == len(layers):
+                layers.append([])
+            layers[level].append(course_id)
+        return layers
+
+    def map_layers(
+        self,
+        func: Callable[[str], Any],
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run func(course_id) for every course, one topological layer at a time.
+
+        Courses within a layer run concurrently on the executor; each layer
+        finishes before the next starts, so func may rely on results already
+        produced for a course's prerequisites.
+
+        Args:
+            func: Function called with each course ID.
+            executor: concurrent.futures executor to use. Pass a
+                      ProcessPoolExecutor for CPU-bound work. If None, a
+                      ThreadPoolExecutor is created for the call.
+            max_workers: Worker count for the executor created when none
+                         is given.
+
+        Returns:
+            A mapping of course ID -> func's return value.
+
+        Raises:
+            Any exception raised by func; later layers are not started.
+        """
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                return self.map_layers(func, executor=pool)
+
+        results: Dict[str, Any] = {}
+        for layer in self.topological_layers():
+            results.update(zip(layer, executor.map(func, layer)))
+        return results
+
+    def _compact_topo_slots(self) -> None:
+        """Drop the holes left by removed courses, keeping the order."""
+        self._topo_slots = [c for c in self._topo_slots if c is not None]
+        self._topo_position = {
+            course_id: slot for slot, course_id in enumerate(self._topo_slots)
+        }
+
+    def _reorder_for_edge(self, prereq_id: str, course_id: str) -> None:
+        """
+        Pearce-Kelly reordering for a new edge prereq_id -> course_id whose
+        endpoints are currently out of order.
+
+        Only courses positioned between the two endpoints are visited:
+            - forward set : reachable from course_id, positioned before prereq_id
+            - backward set: reaching prereq_id, positioned after course_id
+        The backward set is moved in front of the forward set, reusing the
+        same pool of positions.
+
+        Raises:
+            ValueError: if prereq_id is reachable from course_id (a cycle).
+        """
+        position = self._topo_position
+        lower, upper = position[course_id], position[prereq_id]
+
+        forward: List[str] = []
+        seen = {course_id}
+        stack = [course_id]
+        while stack:
+            current = stack.pop()
+            forward.append(current)
+            for dependent in self.graph.get(current, ()):
+                if dependent == prereq_id:
+                    raise ValueError(
+                        f"Adding prerequisite '{prereq_id}' -> '{course_id}' "
+                        "would create a cycle."
+                    )
+                if dependent not in seen and position[dependent] < upper:
+                    seen.add(dependent)
+                    stack.append(dependent)
+
+        backward: List[str] = []
+        seen = {prereq_id}
+        stack = [prereq_id]
+        while stack:
+            current = stack.pop()
+            backward.append(current)
+            for parent in self.reverse_graph.get(current, ()):
+                if parent not in seen and position[parent] > lower:
+                    seen.add(parent)
+                    stack.append(parent)
+
+        forward.sort(key=position.__getitem__)
+        backward.sort(key=position.__getitem__)
+        affected = backward + forward
+        slots = sorted(position[course] for course in affected)
+        for course, slot in zip(affected, slots):
+            position[course] = slot
+            self._topo_slots[slot] = course
+        self._topo_cache = None
+
+    def _kahn_order(self) -> List[str]:
+        """
+        Full topological sort with Kahn's algorithm.
 
         Raises:
             ValueError: if a cycle is detected in the graph.
@@ -165,6 +565,119 @@ class CourseGraph:
 
         return topo_order
 
+    def to_csr(self) -> CSRGraph:
+        """
+        Return a frozen compressed-sparse-row view of the current graph,
+        with integer-interned course IDs and array-backed adjacency.
+        """
+        return CSRGraph.from_course_graph(self)
+
+    # ------------------------------------------------------------------ #
+    # Learning plans
+    # ------------------------------------------------------------------ #
+
+    def plan_to(self, course_id: str, completed: Iterable[str] = ()) -> LearningPlan:
+        """
+        Compute the remaining study needed to reach a course.
+
+        Args:
+            course_id: ID of the target course.
+            completed: IDs of sequences the student has already completed;
+                       they do not count towards the remaining duration.
+
+        Returns:
+            A LearningPlan with the total remaining duration and the critical
+            path through the target's prerequisites.
+
+        Raises:
+            KeyError: if course_id is unknown.
+        """
+        return self.plan_many([course_id], completed)[course_id]
+
+    def plan_many(
+        self,
+        course_ids: Iterable[str],
+        completed: Iterable[str] = (),
+    ) -> Dict[str, LearningPlan]:
+        """
+        Compute learning plans for many target courses at once.
+
+        One reverse pass over the topological order (see _required_by_masks)
+        marks which targets need each course. A single forward DP pass,
+        restricted to the marked courses, then gives every course its
+        earliest finish time: its remaining duration plus the latest finish
+        among its prerequisites. Both passes are shared by all targets.
+
+        Args:
+            course_ids: IDs of the target courses.
+            completed: IDs of sequences the student has already completed.
+
+        Returns:
+            A mapping of target course ID -> LearningPlan.
+
+        Raises:
+            KeyError: if any course_id is unknown.
+        """
+        targets = self._batch_sources(course_ids)
+        # One reverse pass finds, for every course, which targets need it
+        masks = self._required_by_masks(targets)
+        for i, course_id in enumerate(targets):
+            masks[course_id] = masks.get(course_id, 0) | 1 << i
+
+        done = set(completed)
+        remaining: Dict[str, timedelta] = {}
+        finished: Set[str] = set()
+        finish: Dict[str, timedelta] = {}
+        via: Dict[str, Optional[str]] = {}
+        # Unfinished courses of each target's plan, in topological order
+        members: List[List[str]] = [[] for _ in targets]
+
+        for course_id in self._topo_slots:
+            if course_id is None:
+                continue
+            mask = masks.get(course_id, 0)
+            if not mask:
+                continue
+            sequences = self.courses[course_id].sequences
+            pending = [seq.duration for seq in sequences if seq.id not in done]
+            if sequences and not pending:
+                finished.add(course_id)
+            else:
+                while mask:
+                    low = mask & -mask
+                    members[low.bit_length() - 1].append(course_id)
+                    mask ^= low
+            remaining[course_id] = sum(pending, timedelta(0))
+
+            best: Optional[str] = None
+            best_finish = timedelta(0)
+            for parent in sorted(self.reverse_graph.get(course_id, ())):
+                if best is None or finish[parent] > best_finish:
+                    best, best_finish = parent, finish[parent]
+            finish[course_id] = best_finish + remaining[course_id]
+            via[course_id] = best
+
+        plans: Dict[str, LearningPlan] = {}
+        for course_id, courses in zip(targets, members):
+            path: List[str] = []
+            current: Optional[str] = course_id
+            while current is not None:
+                if current not in finished:
+                    path.append(current)
+                current = via[current]
+            path.reverse()
+
+            plans[course_id] = LearningPlan(
+                course_id=course_id,
+                courses=tuple(courses),
+                total_duration=sum(
+                    (remaining[course] for course in courses), timedelta(0)
+                ),
+                critical_path=tuple(path),
+                critical_duration=finish[course_id],
+            )
+        return plans
+
     # ------------------------------------------------------------------ #
     # Course content
     # ------------------------------------------------------------------ #
@@ -173,18 +686,54 @@ class CourseGraph:
         """
         Append a content identifier (e.g., topic name, content ID) to a course.
 
-        Does not replace existing content; always appends.
+        Does not replace existing content. Adding an item the course already
+        has is a no-op, so the original position is kept.
+        """
+        self._ensure_course_exists(course_id)
+        items = self.course_content.setdefault(course_id, {})
+        if content_item in items:
+            return
+        content_item = sys.intern(content_item)
+        items[content_item] = None
+        self._content_courses.setdefault(content_item, set()).add(course_id)
+
+    def remove_content(self, course_id: str, content_item: str) -> None:
+        """
+        Remove a content item from a course.
+
+        Raises:
+            KeyError: if course_id is unknown.
+            ValueError: if the course does not have this content item.
         """
         self._ensure_course_exists(course_id)
-        self.course_content.setdefault(course_id, [])
-        self.course_content[course_id].append(content_item)
+        items = self.course_content.get(course_id, {})
+        if content_item not in items:
+            raise ValueError(
+                f"Course '{course_id}' has no content item '{content_item}'."
+            )
+        del items[content_item]
+        self._unindex_content(content_item, course_id)
+
+    def _unindex_content(self, content_item: str, course_id: str) -> None:
+        courses = self._content_courses[content_item]
+        courses.discard(course_id)
+        if not courses:
+            del self._content_courses[content_item]
 
     def get_content(self, course_id: str) -> List[str]:
         """
-        Retrieve the list of content items associated with a course.
+        Retrieve the list of content items associated with a course,
+        in the order they were added.
 
         Raises:
             KeyError: if course_id is unknown.
         """
         self._ensure_course_exists(course_id)
-        return list(self.course_content.get(course_id, []))
+        return list(self.course_content.get(course_id, {}))
+
+    def courses_with_content(self, content_item: str) -> Set[str]:
+        """
+        Return the IDs of courses that contain a content item, using the
+        reverse content index (empty if no course has it).
+        """
+        return set(self._content_courses.get(content_item, ()))
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, Mapping, Set, Tuple
+
+if TYPE_CHECKING:
+    from core.graph.course_graph import CourseGraph
+
+_MAGIC = b"CGRAPHCS"
+_VERSION = 1
+# magic, version, little-endian flag, node count, edge count, id blob size
+_HEADER = struct.Struct("<8sIIIII")
+
+
+class CSRGraph:
+    """
+    Frozen compressed-sparse-row view of a CourseGraph.
+
+    Course IDs are interned to dense integers (numbered in topological order
+    for locality). Edges are stored in flat uint32 arrays instead of a Python
+    set per course, in both directions:
+        - fwd_offsets / fwd_targets: prereq -> dependents
+        - rev_offsets / rev_targets: course -> prerequisites
+    The neighbours of node i are targets[offsets[i]:offsets[i + 1]].
+
+    The view is read-only; rebuild it with CourseGraph.to_csr() after edits.
+
+    Example:
+        csr = graph.to_csr()
+        csr.ancestors("advanced_programming")
+        csr.save("data/course_graph.csr")
+        csr = CSRGraph.load("data/course_graph.csr")
+    """
+
+    def __init__(
+        self,
+        ids: List[str],
+        fwd_offsets: array,
+        fwd_targets: array,
+        rev_offsets: array,
+        rev_targets: array,
+    ) -> None:
+        self.ids = ids
+        self.index: Dict[str, int] = {course_id: i for i, course_id in enumerate(ids)}
+        self.fwd_offsets = fwd_offsets
+        self.fwd_targets = fwd_targets
+        self.rev_offsets = rev_offsets
+        self.rev_targets = rev_targets
+
+    # ------------------------------------------------------------------ #
+    # Construction
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _pack(
+        ids: List[str],
+        index: Dict[str, int],
+        adjacency: Mapping[str, Set[str]],
+    ) -> Tuple[array, array]:
+        """Pack one adjacency direction into (offsets, targets) arrays."""
+        offsets = array("I", [0])
+        targets = array("I")
+        for course_id in ids:
+            targets.extend(sorted(index[n] for n in adjacency.get(course_id, ())))
+            offsets.append(len(targets))
+        return offsets, targets
+
+    @classmethod
+    def from_course_graph(cls, graph: "CourseGraph") -> "CSRGraph":
+        """Intern the graph's course IDs and pack its edges into arrays."""
+        ids = graph.topological_sort()
+        index = {course_id: i for i, course_id in enumerate(ids)}
+        fwd_offsets, fwd_targets = cls._pack(ids, index, graph.graph)
+        rev_offsets, rev_targets = cls._pack(ids, index, graph.reverse_graph)
+        return cls(ids, fwd_offsets, fwd_targets, rev_offsets, rev_targets)
+
+    # ------------------------------------------------------------------ #
+    # Binary persistence
+    # ------------------------------------------------------------------ #
+
+    def to_bytes(self) -> bytes:
+        """Serialize into the binary format read by from_bytes."""
+        id_offsets = array("I", [0])
+        encoded = []
+        size = 0
+        for course_id in self.ids:
+            chunk = course_id.encode("utf-8")
+            encoded.append(chunk)
+            size += len(chunk)
+            id_offsets.append(size)
+
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            1 if sys.byteorder == "little" else 0,
+            len(self.ids),
+            len(self.fwd_targets),
+            size,
+        )
+        sections = [
+            id_offsets,
+            self.fwd_offsets,
+            self.fwd_targets,
+            self.rev_offsets,
+            self.rev_targets,
+        ]
+        return header + b"".join(s.tobytes() for s in sections) + b"".join(encoded)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CSRGraph":
+        """
+        Restore a graph written by to_bytes with one bulk read per array.
+
+        Raises:
+            ValueError: if the data is not a compatible CSR blob.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Data is too small to be a CSR course graph.")
+        magic, version, little, nodes, edges, id_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a CSR course graph.")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported CSR course graph version {version}.")
+        if bool(little) != (sys.byteorder == "little"):
+            raise ValueError("CSR course graph uses a different byte order.")
+
+        counts = [nodes + 1, nodes + 1, edges, nodes + 1, edges]
+        item = array("I").itemsize
+        if len(data) != _HEADER.size + sum(counts) * item + id_size:
+            raise ValueError("CSR course graph data has the wrong length.")
+
+        offset = _HEADER.size
+        sections = []
+        for count in counts:
+            section = array("I")
+            section.frombytes(data[offset : offset + count * item])
+            sections.append(section)
+            offset += count * item
+
+        id_offsets = sections[0]
+        blob = data[offset:]
+        ids = [
+            blob[id_offsets[i] : id_offsets[i + 1]].decode("utf-8")
+            for i in range(nodes)
+        ]
+        return cls(ids, *sections[1:])
+
+    def save(self, path: str) -> None:
+        """Write the graph to `path`."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "CSRGraph":
+        """Read a graph written by save."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        """Number of courses."""
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of prerequisite edges."""
+        return len(self.fwd_targets)
+
+    def _position(self, course_id: str) -> int:
+        try:
+            return self.index[course_id]
+        except KeyError:
+            raise KeyError(
+                f"Course '{course_id}' is not registered in CSRGraph."
+            ) from None
+
+    def _reachable(self, start: int, offsets: array, targets: array) -> Set[str]:
+        """BFS from `start` (excluded) over one edge direction."""
+        visited = bytearray(len(self.ids))
+        queue: deque[int] = deque([start])
+        found: Set[str] = set()
+        while queue:
+            node = queue.popleft()
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                if not visited[target]:
+                    visited[target] = 1
+                    found.add(self.ids[target])
+                    queue.append(target)
+        return found
+
+    def prerequisites(self, course_id: str) -> Set[str]:
+        """Return the direct prerequisites of a course."""
+        node = self._position(course_id)
+        return {
+            self.ids[self.rev_targets[e]]
+            for e in range(self.rev_offsets[node], self.rev_offsets[node + 1])
+        }
+
+    def ancestors(self, course_id: str) -> Set[str]:
+        """Return all (direct and indirect) prerequisites of a course."""
+        return self._reachable(
+            self._position(course_id), self.rev_offsets, self.rev_targets
+        )
+
+    def descendants(self, course_id: str) -> Set[str]:
+        """Return every course that directly or indirectly requires this one."""
+        return self._reachable(
+            self._position(course_id), self.fwd_offsets, self.fwd_targets
+        )
+
+    def topological_order(self) -> array:
+        """
+        Kahn's algorithm over the offset arrays; returns node indices.
+
+        Raises:
+            ValueError: if a cycle is detected in the graph.
+        """
+        offsets, targets = self.fwd_offsets, self.fwd_targets
+        in_degree = array(
+            "I",
+            (self.rev_offsets[i + 1] - self.rev_offsets[i] for i in range(len(self))),
+        )
+        order = array("I", (i for i in range(len(self)) if in_degree[i] == 0))
+        head = 0
+        while head < len(order):
+            node = order[head]
+            head += 1
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    order.append(target)
+
+        if len(order) != len(self):
+            raise ValueError("Cycle detected in course prerequisites.")
+        return order
+
+    def topological_sort(self) -> List[str]:
+        """Return course IDs in an order that respects prerequisites."""
+        return [self.ids[i] for i in self.topological_order()]
+
+    def ancestor_bitsets(self) -> List[int]:
+        """
+        Transitive closure: per node, an int bitset of its ancestors' indices,
+        computed in one pass over the topological order.
+        """
+        bits = [0] * len(self)
+        for node in self.topological_order():
+            acc = 0
+            for edge in range(self.rev_offsets[node], self.rev_offsets[node + 1]):
+                parent = self.rev_targets[edge]
+                acc |= bits[parent] | (1 << parent)
+            bits[node] = acc
+        return bits
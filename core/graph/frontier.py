@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Set
+
+from core.graph.course_graph import CourseGraph
+from core.models.course import Course
+
+
+class CourseFrontier:
+    """
+    Incrementally maintained set of courses a student can take next.
+
+    A course is *satisfied* once the student has completed any of its
+    sequences (the same rule the CLI uses for prerequisite warnings), and
+    *unlocked* once all of its direct prerequisites are satisfied. The
+    frontier is every unlocked course that is not yet satisfied.
+
+    Internally keeps, per course, a counter of unsatisfied prerequisites
+    seeded from CourseGraph.in_degrees:
+        - mark_satisfied costs O(out-degree) of the satisfied course
+        - eligible() costs O(frontier size)
+
+    The counters are a snapshot of the graph's edges when the frontier is
+    built; build a new frontier after changing prerequisites.
+    """
+
+    def __init__(self, graph: CourseGraph) -> None:
+        self._graph = graph
+        self._remaining: Dict[str, int] = dict(graph.in_degrees)
+        self._satisfied: Set[str] = set()
+        self._frontier: Set[str] = {
+            course_id for course_id, count in self._remaining.items() if count == 0
+        }
+
+    @classmethod
+    def for_student(
+        cls,
+        graph: CourseGraph,
+        courses: Mapping[str, Course],
+        completed_sequences: Iterable[str],
+    ) -> "CourseFrontier":
+        """Build a frontier reflecting a student's already completed sequences."""
+        completed = set(completed_sequences)
+        frontier = cls(graph)
+        for course_id, course in courses.items():
+            if course_id in frontier._remaining and any(
+                seq.id in completed for seq in course.sequences
+            ):
+                frontier.mark_satisfied(course_id)
+        return frontier
+
+    def mark_satisfied(self, course_id: str) -> List[str]:
+        """
+        Record that the student satisfied a course.
+
+        Returns:
+            Courses that became unlocked because of this (possibly empty).
+
+        Raises:
+            KeyError: if course_id is unknown.
+        """
+        if course_id not in self._remaining:
+            raise KeyError(f"Course '{course_id}' is not registered in CourseFrontier.")
+        if course_id in self._satisfied:
+            return []
+
+        self._satisfied.add(course_id)
+        self._frontier.discard(course_id)
+
+        unlocked: List[str] = []
+        for dependent in self._graph.graph.get(course_id, ()):
+            self._remaining[dependent] -= 1
+            if self._remaining[dependent] == 0 and dependent not in self._satisfied:
+                self._frontier.add(dependent)
+                unlocked.append(dependent)
+        return unlocked
+
+    def eligible(self) -> List[str]:
+        """Return unlocked, not yet satisfied courses (in no particular order)."""
+        return list(self._frontier)
+
+    def is_unlocked(self, course_id: str) -> bool:
+        """Return True if every direct prerequisite of the course is satisfied."""
+        return self._remaining[course_id] == 0
+
+    def is_satisfied(self, course_id: str) -> bool:
+        """Return True if the student has satisfied the course."""
+        return course_id in self._satisfied
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Tuple
+
+
+@dataclass(eq=True, frozen=True)
+class LearningPlan:
+    """
+    Remaining study needed to reach a target course.
+
+    Attributes:
+        course_id: The target course's ID.
+        courses: Unfinished courses to study (the target and its prerequisites),
+                 in an order that respects prerequisites.
+        total_duration: Sum of the remaining sequence durations of `courses`.
+        critical_path: Longest prerequisite chain ending at the target, by
+                       remaining duration; the courses that cannot be studied
+                       in parallel.
+        critical_duration: Remaining duration along the critical path, i.e. the
+                           shortest time to finish if independent
+                           prerequisites are studied concurrently.
+    """
+
+    course_id: str
+    courses: Tuple[str, ...]
+    total_duration: timedelta
+    critical_path: Tuple[str, ...]
+    critical_duration: timedelta
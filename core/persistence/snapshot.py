@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import struct
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from core.graph.closure_index import ClosureIndex
+from core.graph.course_graph import CourseGraph
+from core.models.course import Course
+from core.models.sequence import Sequence
+from core.persistence.storage import course_to_dict
+from core.scheduling.sequence_scheduler import SequenceTask
+from core.scheduling.student_scheduler import (
+    CourseTemplate,
+    StudentCursor,
+    StudentScheduler,
+)
+from core.search.inverted_index import InvertedIndex
+from core.search.radix_trie import RadixNode, RadixTrie
+from core.search.trie import ContentTrie, TrieNode
+
+_MAGIC = b"LPSNAPSH"
+# Bump when the file layout changes; attribute changes in the pickled
+# classes are caught by the schema fingerprint instead
+_VERSION = 4
+# magic, version, schema + settings + catalog fingerprint, payload sha256,
+# payload length
+_HEADER = struct.Struct("<8sI32s32sQ")
+
+
+@dataclass
+class PlatformSnapshot:
+    """
+    Fully built in-memory platform state, as assembled at CLI startup.
+
+    Attributes:
+        courses: The catalog the state was built from.
+        course_graph: CourseGraph with prerequisites and content.
+        trie: Autocomplete index over titles.
+        search_index: Full-text InvertedIndex over titles and descriptions.
+        student_scheduler: StudentScheduler with one template per course.
+    """
+
+    courses: Dict[str, Course]
+    course_graph: CourseGraph
+    trie: Union[ContentTrie, RadixTrie]
+    search_index: InvertedIndex
+    student_scheduler: StudentScheduler
+
+
+# Classes whose instances end up in a pickled snapshot
+_SNAPSHOT_CLASSES = (
+    PlatformSnapshot,
+    Course,
+    Sequence,
+    CourseGraph,
+    ClosureIndex,
+    ContentTrie,
+    TrieNode,
+    RadixTrie,
+    RadixNode,
+    InvertedIndex,
+    StudentScheduler,
+    CourseTemplate,
+    StudentCursor,
+    SequenceTask,
+)
+
+
+# ---------------------------------------------------------------
+# Fingerprints
+# ---------------------------------------------------------------
+
+
+def _attribute_names(cls: type) -> List[str]:
+    """Names of the attributes a pickled instance of `cls` carries."""
+    if is_dataclass(cls):
+        return [f.name for f in fields(cls)]
+    instance = cls()
+    if "__getstate__" in vars(cls):
+        return sorted(instance.__getstate__())
+    return sorted(vars(instance))
+
+
+@functools.lru_cache(maxsize=None)
+def schema_fingerprint() -> bytes:
+    """
+    Return a SHA-256 digest of the pickled classes' names and attributes,
+    so snapshots written by a different version of the code are rejected
+    without a manual format-version bump.
+    """
+    digest = hashlib.sha256()
+    for cls in _SNAPSHOT_CLASSES:
+        names = ",".join(_attribute_names(cls))
+        digest.update(f"{cls.__module__}.{cls.__qualname__}:{names}\n".encode())
+    return digest.digest()
+
+
+def catalog_fingerprint(courses: Dict[str, Course]) -> bytes:
+    """
+    Return a SHA-256 digest of the catalog. Any change to a course or its
+    sequences changes the digest and invalidates existing snapshots.
+    """
+    payload = {cid: course_to_dict(c) for cid, c in courses.items()}
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).digest()
+
+
+def settings_fingerprint(settings: Optional[Dict[str, Any]]) -> bytes:
+    """
+    Return a SHA-256 digest of the configuration the state was built with
+    (e.g. the search backend), so a config change invalidates snapshots.
+    """
+    encoded = json.dumps(settings or {}, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).digest()
+
+
+def _state_fingerprint(
+    courses: Dict[str, Course],
+    settings: Optional[Dict[str, Any]],
+) -> bytes:
+    digest = hashlib.sha256(schema_fingerprint())
+    digest.update(settings_fingerprint(settings))
+    digest.update(catalog_fingerprint(courses))
+    return digest.digest()
+
+
+# ---------------------------------------------------------------
+# Snapshot API
+# ---------------------------------------------------------------
+
+
+def save_snapshot(
+    path: str,
+    snapshot: PlatformSnapshot,
+    settings: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Write a versioned, checksummed snapshot to `path`.
+
+    The file is written to a temporary name and renamed into place, so
+    processes loading concurrently never see a partial snapshot.
+
+    Args:
+        path: Snapshot file location.
+        snapshot: The built state to save.
+        settings: JSON-serializable configuration the state was built
+                  with; load_snapshot must be given the same values.
+    """
+    payload = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        _state_fingerprint(snapshot.courses, settings),
+        hashlib.sha256(payload).digest(),
+        len(payload),
+    )
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(
+    path: str,
+    courses: Dict[str, Course],
+    settings: Optional[Dict[str, Any]] = None,
+) -> Optional[PlatformSnapshot]:
+    """
+    Restore a snapshot written by save_snapshot with a single file read.
+
+    The snapshot is unpickled, so only load files this platform wrote.
+    Payloads that fail to unpickle (e.g. a class was renamed without the
+    schema fingerprint noticing) are treated like a stale snapshot.
+
+    Args:
+        path: Snapshot file location.
+        courses: The current catalog; the snapshot is only used if it was
+                 built from an identical catalog.
+        settings: The current configuration; the snapshot is only used if
+                  it was saved with identical settings.
+
+    Returns:
+        The restored PlatformSnapshot, or None if the file is missing, from
+        another format version, corrupted, written by different code, or
+        built from a different catalog or settings.
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, fingerprint, checksum, length = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    if fingerprint != _state_fingerprint(courses, settings):
+        return None
+
+    payload = data[_HEADER.size :]
+    if len(payload) != length or hashlib.sha256(payload).digest() != checksum:
+        return None
+    try:
+        snapshot = pickle.loads(payload)
+    except (pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+        return None
+    if not isinstance(snapshot, PlatformSnapshot):
+        return None
+    return snapshot
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import timedelta
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import heapq
 import itertools
 
+TaskKey = Tuple[str, str]
+
 
 @dataclass(order=True)
 class SequenceTask:
@@ -37,23 +39,155 @@ class SequenceScheduler:
     - Lower priority number => higher priority (1 runs before 5).
     - Among the same priority, tasks are served in FIFO order.
     - Internally uses a min-heap (heapq) with a global counter.
+
+    Tasks are keyed by (course_id, sequence_id). Priority updates and
+    removals use lazy invalidation: the live task for each key is tracked in
+    a dict, and heap entries that are no longer live are skipped when they
+    surface. This gives O(log n) update/removal of a single task and
+    O(k log n) per-course operations; a task keeps its FIFO position across
+    priority updates. The heap is compacted once stale entries outnumber
+    live tasks.
+
+    Each course also has its own lazily invalidated sub-heap holding the same
+    task objects, so the next task of one course is found in O(log n)
+    without touching other courses' entries (see dequeue_next_for).
     """
 
     def __init__(self) -> None:
         self._heap: List[SequenceTask] = []
         self._counter = itertools.count()  # ensures stable ordering
+        # (course_id, sequence_id) -> live task
+        self._tasks: Dict[TaskKey, SequenceTask] = {}
+        # course_id -> sequence_ids of its live tasks
+        self._by_course: Dict[str, Set[str]] = {}
+        # course_id -> sub-heap of the course's tasks (may hold stale entries)
+        self._course_heaps: Dict[str, List[SequenceTask]] = {}
+
+    def __getstate__(self) -> dict:
+        # itertools.count is not reliably picklable; store its next value
+        state = self.__dict__.copy()
+        state["_counter"] = next(self._counter)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._counter = itertools.count(state["_counter"])
+
+    def __len__(self) -> int:
+        """Number of scheduled tasks."""
+        return len(self._tasks)
 
     def schedule(self, task: SequenceTask) -> None:
         """
         Schedule a new sequence task.
 
-        The task's internal _order is set automatically to preserve
-        the insertion order among tasks with the same priority.
+        A copy of the task is scheduled, with its internal _order set to
+        preserve the insertion order among tasks with the same priority.
+        Scheduling a (course_id, sequence_id) that is already scheduled
+        replaces the old task, which moves to the back of its priority.
+        """
+        self._push(self._stamped(task, next(self._counter)))
+
+    @staticmethod
+    def _stamped(task: SequenceTask, order: int) -> SequenceTask:
+        # Heap entries are never changed in place: the task passed in may
+        # still sit in a heap as a stale entry (e.g. a dequeued task being
+        # re-queued), and changing its _order would break that heap.
+        stamped = replace(task)
+        object.__setattr__(stamped, "_order", order)
+        return stamped
+
+    def schedule_many(self, tasks: Iterable[SequenceTask]) -> int:
+        """
+        Schedule many tasks at once, e.g. straight from catalog loading.
+
+        Orders are assigned in iteration order (FIFO among equal priorities,
+        exactly as repeated schedule() calls would), then the heaps are
+        rebuilt with one heapify each instead of one push per task: O(n).
+
+        As with schedule(), copies of the tasks are scheduled. The iterable
+        is read and checked completely before anything is scheduled, so if
+        it raises part-way the scheduler is left unchanged.
+
+        Args:
+            tasks: Any iterable of SequenceTask, consumed once.
+
+        Returns:
+            The number of tasks scheduled.
+
+        Raises:
+            TypeError: if an element is not a SequenceTask. Nothing is
+                scheduled.
         """
-        order_value = next(self._counter)
-        # Create a new task with same data but updated _order
-        object.__setattr__(task, "_order", order_value)
+        # Validate and copy the whole input before changing any state: a
+        # stream that fails part-way, or a non-task element, must not leave
+        # tasks indexed but missing from the heap
+        added: List[SequenceTask] = list(tasks)
+        for task in added:
+            if not isinstance(task, SequenceTask):
+                raise TypeError("tasks must be SequenceTask instances")
+        stamped = self._stamped
+        counter = self._counter
+        added = [stamped(task, next(counter)) for task in added]
+
+        live = self._tasks
+        by_course = self._by_course
+        course_heaps = self._course_heaps
+        for task in added:
+            course_id = task.course_id
+            live[(course_id, task.sequence_id)] = task
+            sequence_ids = by_course.get(course_id)
+            if sequence_ids is None:
+                sequence_ids = by_course[course_id] = set()
+                course_heaps[course_id] = []
+            sequence_ids.add(task.sequence_id)
+            course_heaps[course_id].append(task)
+
+        if not added:
+            return 0
+        self._heap.extend(added)
+        heapq.heapify(self._heap)
+        touched = {task.course_id for task in added}
+        for course_id in touched:
+            heapq.heapify(course_heaps[course_id])
+            self._maybe_compact(course_id)
+        return len(added)
+
+    def _push(self, task: SequenceTask) -> None:
+        key = (task.course_id, task.sequence_id)
+        self._tasks[key] = task
+        self._by_course.setdefault(task.course_id, set()).add(task.sequence_id)
         heapq.heappush(self._heap, task)
+        heapq.heappush(self._course_heaps.setdefault(task.course_id, []), task)
+        self._maybe_compact(task.course_id)
+
+    def _is_live(self, task: SequenceTask) -> bool:
+        return self._tasks.get((task.course_id, task.sequence_id)) is task
+
+    def _forget(self, course_id: str, sequence_id: str) -> SequenceTask:
+        """Drop a live task from the index; its heap entry becomes stale."""
+        task = self._tasks.pop((course_id, sequence_id))
+        sequence_ids = self._by_course[course_id]
+        sequence_ids.discard(sequence_id)
+        if not sequence_ids:
+            del self._by_course[course_id]
+            del self._course_heaps[course_id]
+        self._maybe_compact(course_id)
+        return task
+
+    def _maybe_compact(self, course_id: str) -> None:
+        """Rebuild heaps from live tasks once most of their entries are stale."""
+        if len(self._heap) > 2 * len(self._tasks) + 32:
+            self._heap = list(self._tasks.values())
+            heapq.heapify(self._heap)
+
+        course_heap = self._course_heaps.get(course_id)
+        if course_heap is None:
+            return
+        sequence_ids = self._by_course[course_id]
+        if len(course_heap) > 2 * len(sequence_ids) + 8:
+            course_heap[:] = [self._tasks[(course_id, s)] for s in sequence_ids]
+            heapq.heapify(course_heap)
 
     def dequeue_next(self) -> Optional[SequenceTask]:
         """
@@ -62,77 +196,161 @@ class SequenceScheduler:
         Returns:
             The highest-priority task, or None if the scheduler is empty.
         """
-        if not self._heap:
+        while self._heap:
+            task = heapq.heappop(self._heap)
+            if self._is_live(task):
+                return self._forget(task.course_id, task.sequence_id)
+        return None
+
+    def peek_for(self, course_id: str) -> Optional[SequenceTask]:
+        """
+        Return the next task of a course without removing it.
+
+        Returns:
+            The course's highest-priority task, or None if it has none.
+        """
+        course_heap = self._course_heaps.get(course_id)
+        if course_heap is None:
+            return None
+        # Discard stale entries at the top; live ones are kept
+        while not self._is_live(course_heap[0]):
+            heapq.heappop(course_heap)
+        return course_heap[0]
+
+    def dequeue_next_for(self, course_id: str) -> Optional[SequenceTask]:
+        """
+        Return and remove the next task of a course in O(log n), leaving
+        the order of every other task untouched.
+
+        Returns:
+            The course's highest-priority task, or None if it has none.
+        """
+        task = self.peek_for(course_id)
+        if task is None:
             return None
-        return heapq.heappop(self._heap)
+        heapq.heappop(self._course_heaps[course_id])
+        return self._forget(course_id, task.sequence_id)
 
     def is_empty(self) -> bool:
         """Return True if no tasks are scheduled."""
-        return not self._heap
+        return not self._tasks
+
+    def remove(self, course_id: str, sequence_id: str) -> SequenceTask:
+        """
+        Remove and return one scheduled task in O(log n) amortized.
+
+        Raises:
+            KeyError: if the task is not scheduled.
+        """
+        if (course_id, sequence_id) not in self._tasks:
+            raise KeyError(
+                f"Sequence '{sequence_id}' of course '{course_id}' is not scheduled."
+            )
+        return self._forget(course_id, sequence_id)
 
     def dequeue_by_course(self, course_id: str) -> List[SequenceTask]:
         """
         Remove and return all tasks for a given course_id.
 
         Returns:
-            A list of tasks that belonged to the course.
+            A list of tasks that belonged to the course, in dequeue order.
         """
-        remaining: List[SequenceTask] = []
-        removed: List[SequenceTask] = []
+        sequence_ids = list(self._by_course.get(course_id, ()))
+        removed = [self._forget(course_id, seq_id) for seq_id in sequence_ids]
+        removed.sort()
+        return removed
 
-        while self._heap:
-            task = heapq.heappop(self._heap)
-            if task.course_id == course_id:
-                removed.append(task)
-            else:
-                remaining.append(task)
+    def update_task_priority(
+        self,
+        course_id: str,
+        sequence_id: str,
+        new_priority: int,
+    ) -> None:
+        """
+        Change the priority of one scheduled task (increase or decrease key)
+        in O(log n), keeping its FIFO position among equal priorities.
 
-        # Rebuild heap with remaining tasks
-        for task in remaining:
-            heapq.heappush(self._heap, task)
+        Raises:
+            KeyError: if the task is not scheduled.
+        """
+        task = self._tasks.get((course_id, sequence_id))
+        if task is None:
+            raise KeyError(
+                f"Sequence '{sequence_id}' of course '{course_id}' is not scheduled."
+            )
+        if task.priority == new_priority:
+            return
 
-        return removed
+        updated_task = SequenceTask(
+            priority=new_priority,
+            course_id=task.course_id,
+            sequence_id=task.sequence_id,
+            duration=task.duration,
+        )
+        object.__setattr__(updated_task, "_order", task._order)
+        # The previous heap entry is now stale and skipped when it surfaces
+        self._push(updated_task)
 
     def update_priority(self, course_id: str, new_priority: int) -> None:
         """
         Update the priority of all tasks belonging to a course.
 
-        This is implemented by:
-            - Popping all tasks
-            - Adjusting those matching course_id
-            - Rebuilding the heap
+        Costs O(k log n) for k tasks of the course; tasks keep their FIFO
+        position among equal priorities.
 
         Lower numbers mean higher priority.
         """
-        updated_tasks: List[SequenceTask] = []
-        while self._heap:
-            task = heapq.heappop(self._heap)
-            if task.course_id == course_id:
-                # Create a new task with updated priority but same identity
-                updated_task = SequenceTask(
-                    priority=new_priority,
-                    course_id=task.course_id,
-                    sequence_id=task.sequence_id,
-                    duration=task.duration,
-                )
-                updated_tasks.append(updated_task)
-            else:
-                updated_tasks.append(task)
-
-        # Reset heap and counter (to keep ordering deterministic from now on)
-        self._heap.clear()
-        self._counter = itertools.count()
-        for task in updated_tasks:
-            self.schedule(task)
+        for sequence_id in list(self._by_course.get(course_id, ())):
+            self.update_task_priority(course_id, sequence_id, new_priority)
+
+    def peek(self) -> Optional[SequenceTask]:
+        """
+        Return the next task without removing it.
+
+        Returns:
+            The highest-priority task, or None if the scheduler is empty.
+        """
+        # Discard stale entries at the top; live ones are kept
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    def iter_scheduled(self) -> Iterator[SequenceTask]:
+        """
+        Lazily yield scheduled tasks in the order they would be dequeued.
+
+        Walks the heap array with an auxiliary frontier heap of
+        (task, index) pairs: each step pops the smallest frontier entry and
+        adds its two heap children. The first k tasks cost O(k log k) (plus
+        any stale entries passed over) and the heap is neither copied nor
+        modified. The scheduler must not be changed while iterating.
+        """
+        heap = self._heap
+        if not heap:
+            return
+        frontier: List[Tuple[SequenceTask, int]] = [(heap[0], 0)]
+        while frontier:
+            task, index = heapq.heappop(frontier)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            if self._is_live(task):
+                yield task
+
+    def peek_k(self, k: int) -> List[SequenceTask]:
+        """
+        Return the next k tasks in dequeue order without removing them.
+
+        Raises:
+            ValueError: if k is negative.
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        return list(itertools.islice(self.iter_scheduled(), k))
 
     def list_scheduled(self) -> List[SequenceTask]:
         """
         Return a snapshot list of scheduled tasks in the order
         they would be dequeued (without mutating the scheduler).
         """
-        copied_heap = list(self._heap)
-        heapq.heapify(copied_heap)
-        ordered: List[SequenceTask] = []
-        while copied_heap:
-            ordered.append(heapq.heappop(copied_heap))
-        return ordered
+        return list(self.iter_scheduled())
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from core.models.course import Course
+from core.scheduling.sequence_scheduler import SequenceTask
+
+
+@dataclass(frozen=True)
+class CourseTemplate:
+    """
+    Immutable, shared sequence ordering of one course.
+
+    Attributes:
+        course_id: The course's ID.
+        priority: Default scheduling priority (lower runs first).
+        tasks: The course's sequences as tasks, in completion order.
+        positions: sequence_id -> index into `tasks`.
+    """
+
+    course_id: str
+    priority: int
+    tasks: Tuple[SequenceTask, ...]
+    positions: Dict[str, int] = field(compare=False)
+
+    @classmethod
+    def from_course(cls, course: Course) -> "CourseTemplate":
+        """Build a template from a course, ordered like course.sequences."""
+        tasks = []
+        for order, seq in enumerate(course.sequences):
+            task = SequenceTask(
+                priority=course.difficulty,
+                course_id=course.id,
+                sequence_id=seq.id,
+                duration=seq.duration,
+            )
+            object.__setattr__(task, "_order", order)
+            tasks.append(task)
+        positions = {task.sequence_id: i for i, task in enumerate(tasks)}
+        return cls(course.id, course.difficulty, tuple(tasks), positions)
+
+
+@dataclass
+class StudentCursor:
+    """
+    Per-student overlay on the shared course templates.
+
+    Attributes:
+        positions: course_id -> index of the first not-completed sequence.
+        ahead: course_id -> positions completed beyond the cursor (out of
+               order); usually empty.
+        priorities: course_id -> priority override for this student.
+    """
+
+    positions: Dict[str, int] = field(default_factory=dict)
+    ahead: Dict[str, Set[int]] = field(default_factory=dict)
+    priorities: Dict[str, int] = field(default_factory=dict)
+
+
+class StudentScheduler:
+    """
+    Multi-tenant sequence scheduling over shared course templates.
+
+    Every course's sequence ordering is stored once, as an immutable
+    CourseTemplate. A student only holds a StudentCursor with an index per
+    course they have progressed in, plus optional priority overrides, so
+    memory is O(students + courses) rather than one queue per student.
+
+    - next_for(student, course) is O(1): a lookup of the student's cursor
+      in the shared template.
+    - next_task(student, course_ids) compares the next task of each given
+      course, using the student's priority overrides: O(len(course_ids)),
+      or O(courses) when scanning every template. Pass the student's
+      enrolled courses (or use next_for) on hot paths.
+
+    Example:
+        scheduler = StudentScheduler.from_courses(courses.values())
+        task = scheduler.next_for("s1", "algorithms")
+        scheduler.complete("s1", task.course_id, task.sequence_id)
+    """
+
+    def __init__(self) -> None:
+        self._templates: Dict[str, CourseTemplate] = {}
+        # course_id -> registration rank, used to break priority ties
+        self._rank: Dict[str, int] = {}
+        # sequence_id -> course_id, shared by all students
+        self._sequence_courses: Dict[str, str] = {}
+        self._students: Dict[str, StudentCursor] = {}
+
+    @classmethod
+    def from_courses(cls, courses: Iterable[Course]) -> "StudentScheduler":
+        """Create a scheduler with one template per course."""
+        scheduler = cls()
+        for course in courses:
+            scheduler.add_course(course)
+        return scheduler
+
+    def add_course(self, course: Course) -> None:
+        """
+        Register (or replace) a course template.
+
+        Replacing a template keeps existing cursors, which index into the
+        new template's sequence order.
+        """
+        self._templates[course.id] = CourseTemplate.from_course(course)
+        self._rank.setdefault(course.id, len(self._rank))
+        for seq in course.sequences:
+            self._sequence_courses[seq.id] = course.id
+
+    def _template(self, course_id: str) -> CourseTemplate:
+        try:
+            return self._templates[course_id]
+        except KeyError:
+            raise KeyError(
+                f"Course '{course_id}' is not registered in StudentScheduler."
+            ) from None
+
+    def _cursor(self, student_id: str) -> StudentCursor:
+        cursor = self._students.get(student_id)
+        if cursor is None:
+            cursor = self._students[student_id] = StudentCursor()
+        return cursor
+
+    def has_student(self, student_id: str) -> bool:
+        """Return True if the student has any scheduling state."""
+        return student_id in self._students
+
+    # ------------------------------------------------------------------ #
+    # Progress
+    # ------------------------------------------------------------------ #
+
+    def complete(self, student_id: str, course_id: str, sequence_id: str) -> None:
+        """
+        Mark a sequence as completed for a student.
+
+        Raises:
+            KeyError: if the course or the sequence is unknown.
+        """
+        template = self._template(course_id)
+        try:
+            index = template.positions[sequence_id]
+        except KeyError:
+            raise KeyError(
+                f"Sequence '{sequence_id}' is not part of course '{course_id}'."
+            ) from None
+
+        cursor = self._cursor(student_id)
+        position = cursor.positions.get(course_id, 0)
+        if index < position:
+            return
+        if index > position:
+            cursor.ahead.setdefault(course_id, set()).add(index)
+            return
+
+        # Advance past this sequence and any completed out of order after it
+        position += 1
+        ahead = cursor.ahead.get(course_id)
+        while ahead and position in ahead:
+            ahead.discard(position)
+            position += 1
+        if ahead is not None and not ahead:
+            del cursor.ahead[course_id]
+        cursor.positions[course_id] = position
+
+    def load_completed(self, student_id: str, sequence_ids: Iterable[str]) -> None:
+        """
+        Seed a student's cursors from already completed sequence IDs.
+        IDs of sequences that belong to no registered course are ignored.
+        """
+        self._cursor(student_id)
+        for sequence_id in sequence_ids:
+            course_id = self._sequence_courses.get(sequence_id)
+            if course_id is not None:
+                self.complete(student_id, course_id, sequence_id)
+
+    def set_priority(self, student_id: str, course_id: str, priority: int) -> None:
+        """
+        Override a course's priority for one student (lower runs first).
+
+        Raises:
+            KeyError: if course_id is unknown.
+        """
+        self._template(course_id)
+        self._cursor(student_id).priorities[course_id] = priority
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+
+    def next_for(self, student_id: str, course_id: str) -> Optional[SequenceTask]:
+        """
+        Return the student's next sequence in a course without completing it.
+
+        Returns:
+            The shared template task, or None if the course is finished.
+
+        Raises:
+            KeyError: if course_id is unknown.
+        """
+        template = self._template(course_id)
+        cursor = self._students.get(student_id)
+        position = cursor.positions.get(course_id, 0) if cursor is not None else 0
+        if position >= len(template.tasks):
+            return None
+        return template.tasks[position]
+
+    def next_task(
+        self,
+        student_id: str,
+        course_ids: Optional[Iterable[str]] = None,
+    ) -> Optional[SequenceTask]:
+        """
+        Return the student's highest-priority next sequence across courses.
+
+        Courses are compared by the student's priority for them (override or
+        template default); ties go to the course registered first.
+
+        Costs one next_for lookup per considered course, so with
+        course_ids=None it scans every registered template.
+
+        Args:
+            student_id: The student's ID.
+            course_ids: Courses to consider; all registered courses if None.
+
+        Returns:
+            The next task, or None if every considered course is finished.
+        """
+        if course_ids is None:
+            course_ids = self._templates
+        cursor = self._students.get(student_id)
+        overrides = cursor.priorities if cursor is not None else {}
+
+        best: Optional[Tuple[int, int, SequenceTask]] = None
+        for course_id in course_ids:
+            task = self.next_for(student_id, course_id)
+            if task is None:
+                continue
+            priority = overrides.get(course_id, self._templates[course_id].priority)
+            candidate = (priority, self._rank[course_id], task)
+            if best is None or candidate[:2] < best[:2]:
+                best = candidate
+        return best[2] if best is not None else None
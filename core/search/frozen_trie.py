@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+if TYPE_CHECKING:
+    from core.search.trie import TrieNode
+
+_MAGIC = b"CTRIEFRZ"
+_VERSION = 1
+# magic, version, little-endian flag, node count, edge count, value count, blob size
+_HEADER = struct.Struct("<8sIIIIII")
+
+
+class FrozenTrie:
+    """
+    Immutable, array-backed snapshot of a ContentTrie.
+
+    Layout (all integer arrays are uint32, nodes numbered in preorder with
+    children visited in character order):
+        - edge_offsets : node -> first outgoing edge (CSR style, n + 1 items)
+        - edge_labels  : Unicode code point of each edge, sorted per node
+        - edge_targets : child node index of each edge
+        - value_offsets: node -> first value it owns (n + 1 items)
+        - subtree_end  : node -> one past the last node in its subtree
+        - blob_offsets : value -> byte offset of its JSON encoding (m + 1 items)
+        - blob         : concatenated JSON-encoded values (the side table)
+
+    Because nodes and values are both laid out in preorder, every value
+    under a prefix lives in one contiguous slice of the value table.
+
+    Instances built by `save`/`load` read straight out of a memory-mapped
+    file, so many worker processes share one copy of the index through the
+    page cache. Values must be JSON-serializable.
+
+    Example:
+        trie.freeze().save("data/search.idx")
+        frozen = FrozenTrie.load("data/search.idx")
+        frozen.autocomplete("arr")
+    """
+
+    def __init__(
+        self,
+        edge_offsets: Union[array, memoryview],
+        edge_labels: Union[array, memoryview],
+        edge_targets: Union[array, memoryview],
+        value_offsets: Union[array, memoryview],
+        subtree_end: Union[array, memoryview],
+        blob_offsets: Union[array, memoryview],
+        blob: Union[bytes, memoryview],
+        _mapping: Optional[mmap.mmap] = None,
+    ) -> None:
+        self._edge_offsets = edge_offsets
+        self._edge_labels = edge_labels
+        self._edge_targets = edge_targets
+        self._value_offsets = value_offsets
+        self._subtree_end = subtree_end
+        self._blob_offsets = blob_offsets
+        self._blob = blob
+        self._mapping = _mapping
+
+    # ------------------------------------------------------------------ #
+    # Construction
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def from_root(cls, root: "TrieNode") -> "FrozenTrie":
+        """Flatten the trie rooted at `root` into a FrozenTrie."""
+        # Pass 1: preorder numbering with an explicit stack
+        preorder: List["TrieNode"] = []
+        index_of: Dict[int, int] = {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            index_of[id(node)] = len(preorder)
+            preorder.append(node)
+            for ch in sorted(node.children, reverse=True):
+                stack.append(node.children[ch])
+
+        # Pass 2: emit edges and values in preorder
+        edge_offsets = array("I", [0])
+        edge_labels = array("I")
+        edge_targets = array("I")
+        value_offsets = array("I", [0])
+        blob_offsets = array("I", [0])
+        chunks: List[bytes] = []
+        blob_size = 0
+
+        for node in preorder:
+            for ch in sorted(node.children):
+                edge_labels.append(ord(ch))
+                edge_targets.append(index_of[id(node.children[ch])])
+            edge_offsets.append(len(edge_labels))
+
+            for value in node.values:
+                chunk = json.dumps(value).encode("utf-8")
+                chunks.append(chunk)
+                blob_size += len(chunk)
+                blob_offsets.append(blob_size)
+            value_offsets.append(len(blob_offsets) - 1)
+
+        # Pass 3: a subtree ends where its last child's subtree ends
+        subtree_end = array("I", range(1, len(preorder) + 1))
+        for idx in range(len(preorder) - 1, -1, -1):
+            first, last = edge_offsets[idx], edge_offsets[idx + 1]
+            if last > first:
+                subtree_end[idx] = subtree_end[edge_targets[last - 1]]
+
+        return cls(
+            edge_offsets,
+            edge_labels,
+            edge_targets,
+            value_offsets,
+            subtree_end,
+            blob_offsets,
+            b"".join(chunks),
+        )
+
+    # ------------------------------------------------------------------ #
+    # Binary persistence
+    # ------------------------------------------------------------------ #
+
+    def _sections(self) -> List[Union[array, memoryview]]:
+        return [
+            self._edge_offsets,
+            self._edge_labels,
+            self._edge_targets,
+            self._value_offsets,
+            self._subtree_end,
+            self._blob_offsets,
+        ]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the snapshot into the binary format read by `load`."""
+        node_count = len(self._subtree_end)
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            1 if sys.byteorder == "little" else 0,
+            node_count,
+            len(self._edge_labels),
+            len(self._blob_offsets) - 1,
+            len(self._blob),
+        )
+        parts = [header]
+        for section in self._sections():
+            parts.append(bytes(section))
+        parts.append(bytes(self._blob))
+        return b"".join(parts)
+
+    def save(self, path: str) -> None:
+        """Write the snapshot to `path`."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: Union[bytes, mmap.mmap],
+        _mapping: Optional[mmap.mmap] = None,
+    ) -> "FrozenTrie":
+        """
+        Build a FrozenTrie viewing `buffer` without copying it.
+
+        Raises:
+            ValueError: if the buffer is not a compatible snapshot.
+        """
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("Buffer is too small to be a frozen trie snapshot.")
+        header = _HEADER.unpack_from(view)
+        magic, version, little, nodes, edges, values, blob_size = header
+        if magic != _MAGIC:
+            raise ValueError("Not a frozen trie snapshot.")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported frozen trie version {version}.")
+        if bool(little) != (sys.byteorder == "little"):
+            raise ValueError("Frozen trie snapshot uses a different byte order.")
+
+        item = array("I").itemsize
+        counts = [nodes + 1, edges, edges, nodes + 1, nodes, values + 1]
+        if len(view) < _HEADER.size + sum(counts) * item + blob_size:
+            raise ValueError("Frozen trie snapshot is truncated.")
+
+        offset = _HEADER.size
+        sections = []
+        for count in counts:
+            size = count * item
+            sections.append(view[offset : offset + size].cast("I"))
+            offset += size
+        blob = view[offset : offset + blob_size]
+        return cls(*sections, blob, _mapping=_mapping)
+
+    @classmethod
+    def load(cls, path: str) -> "FrozenTrie":
+        """Memory-map a snapshot written by `save` and query it in place."""
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(mapping, _mapping=mapping)
+
+    def close(self) -> None:
+        """Release the memory mapping, if any. The trie is unusable afterwards."""
+        if self._mapping is not None:
+            for section in self._sections():
+                section.release()
+            self._blob.release()
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self) -> "FrozenTrie":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        """Number of stored values."""
+        return len(self._blob_offsets) - 1
+
+    def _find_node(self, prefix: str) -> Optional[int]:
+        """Return the node index for `prefix`, or None if it is not present."""
+        node = 0
+        # Same normalization as ContentTrie._normalize_key
+        for ch in prefix.lower():
+            lo, hi = self._edge_offsets[node], self._edge_offsets[node + 1]
+            code = ord(ch)
+            pos = bisect.bisect_left(self._edge_labels, code, lo, hi)
+            if pos == hi or self._edge_labels[pos] != code:
+                return None
+            node = self._edge_targets[pos]
+        return node
+
+    def _value_at(self, idx: int) -> Any:
+        start, end = self._blob_offsets[idx], self._blob_offsets[idx + 1]
+        return json.loads(bytes(self._blob[start:end]))
+
+    def autocomplete(self, prefix: str, limit: Optional[int] = None) -> List[Any]:
+        """
+        Return values whose keys start with the given prefix.
+
+        Values come back in key order (then insertion order within a key).
+
+        Args:
+            prefix: The prefix to search for; empty string returns everything.
+            limit: Maximum number of values to return. None means no limit.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be non-negative")
+
+        node = self._find_node(prefix)
+        if node is None:
+            return []
+
+        start = self._value_offsets[node]
+        end = self._value_offsets[self._subtree_end[node]]
+        if limit is not None:
+            end = min(end, start + limit)
+        return [self._value_at(idx) for idx in range(start, end)]
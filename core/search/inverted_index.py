@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import re
+from array import array
+from typing import Any, Dict, List, Sequence
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class InvertedIndex:
+    """
+    Token-level inverted index for searching words anywhere in a title.
+
+    Complements ContentTrie, which only matches from the start of a key:
+    here "lists" finds "Linked Lists".
+
+    Internally uses:
+        - _documents: list mapping integer document ID -> stored value
+        - _postings : token -> sorted array('I') of document IDs
+        - _vocabulary: sorted token list, so a token prefix maps to one
+                       contiguous range found by binary search
+
+    Example:
+        index = InvertedIndex()
+        index.add_document("Linked Lists", "Linked Lists", "Pointers and nodes")
+        index.search("lists")          # ["Linked Lists"]
+        index.search("link nod")       # AND of both token prefixes
+    """
+
+    def __init__(self) -> None:
+        self._documents: List[Any] = []
+        self._postings: Dict[str, array] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lowercase word tokens."""
+        return _TOKEN_PATTERN.findall(text.lower())
+
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return len(self._documents)
+
+    def add_document(self, value: Any, *texts: str) -> int:
+        """
+        Index a document under every token of the given texts.
+
+        Args:
+            value: Value returned by searches that match this document.
+            texts: Title, description or any other searchable text.
+
+        Returns:
+            The integer document ID assigned to the document.
+        """
+        doc_id = len(self._documents)
+        self._documents.append(value)
+
+        for text in texts:
+            for token in self.tokenize(text):
+                postings = self._postings.get(token)
+                if postings is None:
+                    self._postings[token] = array("I", [doc_id])
+                    self._vocabulary_dirty = True
+                elif postings[-1] != doc_id:
+                    # IDs are handed out in increasing order, so appending
+                    # keeps every posting list sorted.
+                    postings.append(doc_id)
+        return doc_id
+
+    def _sorted_vocabulary(self) -> List[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        return self._vocabulary
+
+    def _postings_for(self, token: str, prefix: bool) -> Sequence[int]:
+        """Return the sorted document IDs for a token (or token prefix)."""
+        if not prefix:
+            return self._postings.get(token, array("I"))
+
+        vocabulary = self._sorted_vocabulary()
+        start = bisect.bisect_left(vocabulary, token)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(token):
+            end += 1
+
+        if end - start == 1:
+            return self._postings[vocabulary[start]]
+        return self._union([self._postings[t] for t in vocabulary[start:end]])
+
+    @staticmethod
+    def _union(posting_lists: List[Sequence[int]]) -> List[int]:
+        """Merge sorted ID lists into one sorted, duplicate-free list."""
+        merged: List[int] = []
+        for doc_id in heapq.merge(*posting_lists):
+            if not merged or merged[-1] != doc_id:
+                merged.append(doc_id)
+        return merged
+
+    @staticmethod
+    def _intersect(smaller: Sequence[int], larger: Sequence[int]) -> List[int]:
+        """
+        Intersect two sorted ID lists in O(m log n) by binary-searching the
+        larger list from the last match onwards.
+        """
+        result: List[int] = []
+        lo = 0
+        for doc_id in smaller:
+            lo = bisect.bisect_left(larger, doc_id, lo)
+            if lo == len(larger):
+                break
+            if larger[lo] == doc_id:
+                result.append(doc_id)
+        return result
+
+    def search_ids(
+        self,
+        query: str,
+        mode: str = "and",
+        prefix: bool = True,
+    ) -> List[int]:
+        """
+        Return sorted document IDs matching the query tokens.
+
+        Args:
+            query: Free text; each token is matched independently.
+            mode: "and" requires every token, "or" requires any token.
+            prefix: If True, a query token matches every indexed token that
+                    starts with it ("alg" matches "algorithms").
+
+        Raises:
+            ValueError: if mode is not "and" or "or".
+        """
+        if mode not in ("and", "or"):
+            raise ValueError("mode must be 'and' or 'or'")
+
+        tokens = self.tokenize(query)
+        if not tokens:
+            return []
+        posting_lists = [self._postings_for(t, prefix) for t in dict.fromkeys(tokens)]
+
+        if mode == "or":
+            return self._union(posting_lists)
+
+        # Intersect smallest-first so intermediate results stay small
+        posting_lists.sort(key=len)
+        result: Sequence[int] = posting_lists[0]
+        for postings in posting_lists[1:]:
+            if not result:
+                break
+            result = self._intersect(result, postings)
+        return list(result)
+
+    def search(self, query: str, mode: str = "and", prefix: bool = True) -> List[Any]:
+        """
+        Return stored values of documents matching the query.
+
+        See search_ids for the meaning of the arguments. Values come back in
+        the order their documents were added.
+        """
+        return [self._documents[i] for i in self.search_ids(query, mode, prefix)]
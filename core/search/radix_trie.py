@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import gc
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.search.trie import ContentTrie, RankedEntry
+
+
+@dataclass(slots=True)
+class RadixNode:
+    """
+    A node in the RadixTrie.
+
+    Attributes:
+        label: Edge label leading from the parent to this node. Chains of
+               single-child nodes are merged into one multi-character label.
+        children: Mapping of first label character -> child RadixNode.
+        entries: Ranked entries stored at this node when it represents the
+                 end of one or more inserted keys.
+    """
+
+    label: str = ""
+    children: Dict[str, "RadixNode"] = field(default_factory=dict)
+    entries: List[RankedEntry] = field(default_factory=list)
+
+
+class RadixTrie:
+    """
+    Compressed (PATRICIA / radix) trie for prefix-based search of content.
+
+    Drop-in alternative to ContentTrie with the same insert/autocomplete API.
+    Single-child chains are stored as one edge label instead of one node per
+    character, which cuts node count (and memory) sharply for long titles.
+
+    Ranked autocomplete is supported but, unlike ContentTrie, is computed by
+    a full subtree traversal: no per-node best-k caches are kept, trading
+    ranked-query latency for a smaller footprint.
+
+    Example:
+        trie = RadixTrie()
+        trie.insert("arrays", "Arrays - Introduction")
+        trie.insert("arraylist", "ArrayList - Dynamic Arrays")
+
+        results = trie.autocomplete("arr")
+        # results contains both values.
+    """
+
+    def __init__(self) -> None:
+        self._root = RadixNode()
+        self._sequence = itertools.count()
+
+    # Keys must normalize exactly like ContentTrie so the two are interchangeable
+    _normalize_key = staticmethod(ContentTrie._normalize_key)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # itertools.count is not reliably picklable; store its next value
+        state = self.__dict__.copy()
+        state["_sequence"] = next(self._sequence)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._sequence = itertools.count(state["_sequence"])
+
+    def insert(self, key: str, value: Any, weight: float = 0.0) -> None:
+        """
+        Insert a (key, value) pair into the trie.
+
+        Args:
+            key: The string key, such as a title or keyword.
+            value: Arbitrary value associated with the key.
+            weight: Ranking weight used by ranked autocomplete.
+        """
+        if not isinstance(key, str):
+            raise TypeError("key must be a string")
+
+        normalized = self._normalize_key(key)
+        node = self._root
+        i = 0
+
+        while i < len(normalized):
+            child = node.children.get(normalized[i])
+            if child is None:
+                # No edge shares a first character: hang the rest as one leaf
+                child = RadixNode(label=normalized[i:])
+                node.children[normalized[i]] = child
+                node = child
+                break
+
+            label = child.label
+            j = 0
+            limit = min(len(label), len(normalized) - i)
+            while j < limit and label[j] == normalized[i + j]:
+                j += 1
+
+            if j < len(label):
+                # Split the edge at the first mismatch (or end of key)
+                middle = RadixNode(label=label[:j])
+                child.label = label[j:]
+                middle.children[child.label[0]] = child
+                node.children[normalized[i]] = middle
+                child = middle
+
+            node = child
+            i += j
+
+        node.entries.append((-weight, next(self._sequence), value))
+
+    def bulk_insert(
+        self, items: Iterable[Tuple[Any, ...]], pause_gc: bool = False
+    ) -> None:
+        """
+        Insert many (key, value) or (key, value, weight) tuples.
+
+        Provided for API parity with ContentTrie.bulk_insert, including its
+        process-wide pause_gc opt-in for single-threaded cold starts.
+        """
+        gc_was_enabled = gc.isenabled()
+        if pause_gc:
+            gc.disable()
+        try:
+            for item in items:
+                self.insert(*item)
+        finally:
+            if pause_gc and gc_was_enabled:
+                gc.enable()
+
+    def _find_node(self, prefix: str) -> Optional[RadixNode]:
+        """
+        Find the highest node whose subtree holds every key with this prefix.
+
+        The prefix may end part-way along an edge label, in which case the
+        node below that edge is returned.
+
+        Returns:
+            The RadixNode for the prefix, or None if the prefix is not present.
+        """
+        normalized = self._normalize_key(prefix)
+        node = self._root
+        i = 0
+
+        while i < len(normalized):
+            child = node.children.get(normalized[i])
+            if child is None:
+                return None
+            if normalized.startswith(child.label, i):
+                i += len(child.label)
+                node = child
+            elif child.label.startswith(normalized[i:]):
+                return child
+            else:
+                return None
+        return node
+
+    def autocomplete(
+        self,
+        prefix: str,
+        limit: Optional[int] = None,
+        ranked: bool = False,
+    ) -> List[Any]:
+        """
+        Return values whose keys start with the given prefix.
+
+        Args:
+            prefix: The prefix to search for.
+                    If empty string, returns all values stored in the trie.
+            limit: Maximum number of values to return. None means no limit.
+            ranked: If True, return values ordered by descending weight.
+
+        Returns:
+            A list of values associated with keys that share this prefix.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be non-negative")
+        if limit == 0:
+            return []
+
+        start_node = self._find_node(prefix)
+        if start_node is None:
+            return []
+
+        if ranked:
+            entries: List[RankedEntry] = []
+            self._collect_entries(start_node, entries)
+            if limit is None:
+                entries.sort()
+            else:
+                entries = heapq.nsmallest(limit, entries)
+            return [value for _, _, value in entries]
+
+        collected: List[Any] = []
+        self._collect_values(start_node, collected, limit)
+        return collected
+
+    def _collect_values(
+        self,
+        node: RadixNode,
+        collected: List[Any],
+        limit: Optional[int] = None,
+    ) -> bool:
+        """
+        Depth-first traversal from the given node, collecting values.
+
+        Returns:
+            True once `limit` values have been collected, so callers can stop.
+        """
+        for _, _, value in node.entries:
+            collected.append(value)
+            if limit is not None and len(collected) >= limit:
+                return True
+
+        for child in node.children.values():
+            if self._collect_values(child, collected, limit):
+                return True
+        return False
+
+    def _collect_entries(self, node: RadixNode, collected: List[RankedEntry]) -> None:
+        """
+        Depth-first traversal from the given node, collecting ranked entries.
+        """
+        collected.extend(node.entries)
+        for child in node.children.values():
+            self._collect_entries(child, collected)
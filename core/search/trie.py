@@ -1,24 +1,90 @@
 from __future__ import annotations
 
+import bisect
+import gc
+import heapq
+import itertools
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
+from core.search.frozen_trie import FrozenTrie
 
-@dataclass
+# (negated weight, insertion sequence, value). Sorting these tuples ascending
+# yields the heaviest values first, with ties broken by insertion order.
+RankedEntry = Tuple[float, int, Any]
+
+
+class CacheInfo(NamedTuple):
+    """Autocomplete result cache statistics (mirrors functools.lru_cache)."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+@dataclass(frozen=True)
+class AutocompleteCursor:
+    """
+    Resumable position in a prefix's autocomplete results.
+
+    Attributes:
+        prefix: Normalized prefix the cursor was issued for.
+        key: Normalized key of the last value returned.
+        offset: Number of values of `key` already returned.
+    """
+
+    prefix: str
+    key: str
+    offset: int
+
+
+@dataclass(slots=True)
 class TrieNode:
     """
     A node in the ContentTrie.
 
     Attributes:
         children: Mapping of character -> child TrieNode.
-        values: List of values stored at this node when it represents
-                the end of one or more inserted keys.
+        entries: Mapping of value -> ranked entry (see RankedEntry) for values
+                 stored at this node when it represents the end of one or
+                 more inserted keys. Keyed by value, so duplicates collapse.
         is_terminal: True if this node marks the end of at least one key.
+        top: Cached best entries of the whole subtree rooted at this node,
+             sorted best-first and capped at the trie's top_k.
     """
 
     children: Dict[str, "TrieNode"] = field(default_factory=dict)
-    values: List[Any] = field(default_factory=list)
+    entries: Dict[Any, RankedEntry] = field(default_factory=dict)
     is_terminal: bool = False
+    top: List[RankedEntry] = field(default_factory=list)
+
+    @property
+    def values(self) -> List[Any]:
+        """Values stored at this node, in insertion order."""
+        return list(self.entries)
+
+    def copy(self) -> "TrieNode":
+        """Shallow copy used for path-copying: children are shared, not cloned."""
+        return TrieNode(
+            children=dict(self.children),
+            entries=dict(self.entries),
+            is_terminal=self.is_terminal,
+            top=list(self.top),
+        )
 
 
 class ContentTrie:
@@ -27,17 +93,60 @@ class ContentTrie:
 
     Keys are normalized to lowercase, making the trie case-insensitive.
 
+    Each node caches the `top_k` best (highest weight) entries of its subtree,
+    so ranked autocomplete with a small limit is answered without traversing
+    the subtree at all.
+
+    An optional LRU cache (`cache_size` > 0) keeps recent autocomplete results
+    per normalized prefix. Entries are stamped with a generation counter that
+    every mutation bumps, so invalidation is O(1): stale entries are simply
+    treated as misses.
+
+    With `copy_on_write=True` the trie is safe to read from many threads
+    while a background thread updates it (read-copy-update): writers copy
+    the nodes on the path they change and publish a new root with a single
+    reference swap, so every read runs lock-free against a consistent
+    snapshot (only the optional result cache takes a brief lock for its
+    bookkeeping). Writers are serialized by a lock in either mode.
+
     Example:
         trie = ContentTrie()
         trie.insert("arrays", "Arrays - Introduction")
-        trie.insert("arraylist", "ArrayList - Dynamic Arrays")
+        trie.insert("arraylist", "ArrayList - Dynamic Arrays", weight=5)
 
         results = trie.autocomplete("arr")
         # results contains both values.
+
+        best = trie.autocomplete("arr", limit=1, ranked=True)
+        # ["ArrayList - Dynamic Arrays"]
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        top_k: int = 10,
+        cache_size: int = 0,
+        copy_on_write: bool = False,
+    ) -> None:
+        if top_k < 0:
+            raise ValueError("top_k must be non-negative")
+        if cache_size < 0:
+            raise ValueError("cache_size must be non-negative")
         self._root = TrieNode()
+        self._top_k = top_k
+        self._sequence = itertools.count()
+
+        # Writers are serialized; readers never take this lock
+        self._copy_on_write = copy_on_write
+        self._write_lock = threading.Lock()
+
+        # (normalized prefix, limit, ranked) -> (generation, results)
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_size = cache_size
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
 
     @staticmethod
     def _normalize_key(key: str) -> str:
@@ -48,28 +157,379 @@ class ContentTrie:
         """
         return key.lower()
 
-    def insert(self, key: str, value: Any) -> None:
+    # ------------------------------------------------------------------ #
+    # Pickling (used by platform snapshots)
+    # ------------------------------------------------------------------ #
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop locks and cached results; store the insertion counter as int."""
+        with self._write_lock:
+            state = self.__dict__.copy()
+            state["_sequence"] = next(self._sequence)
+        for name in ("_write_lock", "_cache_lock", "_cache"):
+            del state[name]
+        state["_hits"] = state["_misses"] = state["_evictions"] = 0
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._sequence = itertools.count(state["_sequence"])
+        self._write_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Write transactions
+    # ------------------------------------------------------------------ #
+
+    def _begin_write(self) -> Tuple[TrieNode, Optional[Set[int]]]:
+        """
+        Start a write against the current root.
+
+        Returns:
+            (root, owned): in copy-on-write mode `root` is a private copy and
+            `owned` tracks the ids of nodes this write may mutate in place;
+            otherwise the live root and None (everything is mutable).
+        """
+        if not self._copy_on_write:
+            return self._root, None
+        root = self._root.copy()
+        return root, {id(root)}
+
+    def _publish(self, root: TrieNode) -> None:
+        """Make a finished write visible to readers with one reference swap."""
+        self._root = root
+        self._generation += 1
+
+    @staticmethod
+    def _writable_child(
+        node: TrieNode,
+        ch: str,
+        owned: Optional[Set[int]],
+        create: bool = True,
+    ) -> Optional[TrieNode]:
+        """
+        Return node.children[ch] in a state the current write may mutate.
+
+        Shared children are path-copied in copy-on-write mode; missing
+        children are created when `create` is True.
+        """
+        child = node.children.get(ch)
+        if child is None:
+            if not create:
+                return None
+            child = TrieNode()
+        elif owned is None or id(child) in owned:
+            return child
+        else:
+            child = child.copy()
+        node.children[ch] = child
+        if owned is not None:
+            owned.add(id(child))
+        return child
+
+    def insert(self, key: str, value: Any, weight: float = 0.0) -> None:
         """
         Insert a (key, value) pair into the trie.
 
+        Values are deduplicated per key: inserting the same pair again only
+        updates its weight, so re-seeding does not grow the trie.
+
         Args:
             key: The string key, such as a title or keyword.
             value: Arbitrary value associated with the key (course ID, title, object, etc.).
+                   Must be hashable.
+            weight: Ranking weight (e.g. popularity) used by ranked autocomplete.
+                    Higher weights rank first.
+
+        Raises:
+            TypeError: if key is not a string or value is unhashable. The
+                trie is left unchanged.
         """
         if not isinstance(key, str):
             raise TypeError("key must be a string")
+        # Values are dict keys; reject unhashable ones before creating nodes
+        hash(value)
 
         normalized = self._normalize_key(key)
-        node = self._root
+        with self._write_lock:
+            root, owned = self._begin_write()
+            if self._insert_into(root, owned, normalized, value, weight):
+                self._publish(root)
+
+    def _insert_into(
+        self,
+        root: TrieNode,
+        owned: Optional[Set[int]],
+        normalized: str,
+        value: Any,
+        weight: float,
+    ) -> bool:
+        """Insert below `root`; return True if the trie changed."""
+        node = root
+        path = [node]
 
         # Traverse or create nodes for each character
         for ch in normalized:
-            if ch not in node.children:
-                node.children[ch] = TrieNode()
-            node = node.children[ch]
+            node = self._writable_child(node, ch, owned)
+            path.append(node)
 
         node.is_terminal = True
-        node.values.append(value)
+        existing = node.entries.get(value)
+        if existing is not None:
+            if existing[0] == -weight:
+                return False
+            # Keep the original insertion order, only re-rank
+            node.entries[value] = (-weight, existing[1], value)
+            self._rebuild_tops(path)
+            return True
+
+        entry: RankedEntry = (-weight, next(self._sequence), value)
+        node.entries[value] = entry
+
+        # Every node on the path now has this entry somewhere in its subtree
+        for path_node in path:
+            self._offer_top(path_node, entry)
+        return True
+
+    @classmethod
+    def from_sorted(
+        cls,
+        items: Iterable[Tuple[Any, ...]],
+        top_k: int = 10,
+        cache_size: int = 0,
+        copy_on_write: bool = False,
+        pause_gc: bool = False,
+    ) -> "ContentTrie":
+        """
+        Build a trie from (key, value) or (key, value, weight) tuples in bulk.
+
+        Much faster than one insert() per item for cold-start index builds;
+        see bulk_insert (including pause_gc). The items do not need to be
+        pre-sorted.
+        """
+        trie = cls(top_k=top_k, cache_size=cache_size, copy_on_write=copy_on_write)
+        trie.bulk_insert(items, pause_gc=pause_gc)
+        return trie
+
+    def bulk_insert(
+        self, items: Iterable[Tuple[Any, ...]], pause_gc: bool = False
+    ) -> None:
+        """
+        Insert many (key, value) or (key, value, weight) tuples at once.
+
+        Keys are normalized and sorted once; the trie is then built in a
+        single pass that reuses the path shared with the previous key, so
+        common prefixes are walked once instead of once per key. Cached
+        best-k lists are computed once per touched node, when the sorted
+        pass leaves that node's subtree for good.
+
+        Args:
+            items: (key, value) or (key, value, weight) tuples, in any order.
+            pause_gc: Disable the cyclic garbage collector during the build.
+                The build allocates many nodes but no garbage cycles, so this
+                avoids repeated rescans of the growing trie. It affects the
+                whole process, so only use it for single-threaded cold starts.
+
+        Raises:
+            TypeError: if a key is not a string or a value is unhashable.
+                Nothing is inserted.
+        """
+        normalized_items = []
+        for item in items:
+            key, value = item[0], item[1]
+            if not isinstance(key, str):
+                raise TypeError("key must be a string")
+            hash(value)
+            weight = item[2] if len(item) > 2 else 0.0
+            normalized_items.append(
+                (self._normalize_key(key), next(self._sequence), value, weight)
+            )
+        if not normalized_items:
+            return
+        # Stable sort keeps insertion order among values of the same key
+        normalized_items.sort(key=lambda entry: entry[0])
+
+        gc_was_enabled = gc.isenabled()
+        if pause_gc:
+            gc.disable()
+        try:
+            with self._write_lock:
+                root, owned = self._begin_write()
+                self._bulk_build(root, owned, normalized_items)
+                self._publish(root)
+        finally:
+            if pause_gc and gc_was_enabled:
+                gc.enable()
+
+    def _bulk_build(
+        self,
+        root: TrieNode,
+        owned: Optional[Set[int]],
+        normalized_items: List[Tuple[str, int, Any, float]],
+    ) -> None:
+        """Single sorted pass of bulk_insert below `root`."""
+        path = [root]
+        previous = ""
+        for normalized, seq, value, weight in normalized_items:
+            shared = 0
+            limit = min(len(previous), len(normalized))
+            while shared < limit and previous[shared] == normalized[shared]:
+                shared += 1
+
+            # Nodes below the shared prefix are complete: finalize them
+            while len(path) > shared + 1:
+                self._finalize_top(path.pop())
+
+            node = path[-1]
+            fresh = False
+            for ch in normalized[shared:]:
+                if fresh:
+                    # Below a freshly created node every child is new as well
+                    child = TrieNode()
+                    node.children[ch] = child
+                else:
+                    fresh = ch not in node.children
+                    child = self._writable_child(node, ch, owned)
+                node = child
+                path.append(node)
+
+            node.is_terminal = True
+            existing = node.entries.get(value)
+            if existing is None:
+                node.entries[value] = (-weight, seq, value)
+            else:
+                node.entries[value] = (-weight, existing[1], value)
+            previous = normalized
+
+        while path:
+            self._finalize_top(path.pop())
+
+    def _finalize_top(self, node: TrieNode) -> None:
+        """Recompute one node's best-k list from its entries and children."""
+        if not node.entries and len(node.children) == 1:
+            # Single-child chains (most nodes) just inherit the child's list
+            (child,) = node.children.values()
+            node.top = child.top[:]
+            return
+        candidates = list(node.entries.values())
+        for child in node.children.values():
+            candidates.extend(child.top)
+        node.top = heapq.nsmallest(self._top_k, candidates)
+
+    def remove(self, key: str, value: Any) -> bool:
+        """
+        Remove a (key, value) pair from the trie.
+
+        Branches left without values are pruned, and the cached best-k lists
+        along the key's path are rebuilt.
+
+        Returns:
+            True if the pair was present and removed, False otherwise.
+        """
+        normalized = self._normalize_key(key)
+        with self._write_lock:
+            node = self._find_node(key)
+            if node is None or value not in node.entries:
+                return False
+            root, owned = self._begin_write()
+            self._remove_from(root, owned, normalized, value)
+            self._publish(root)
+        return True
+
+    def _remove_from(
+        self,
+        root: TrieNode,
+        owned: Optional[Set[int]],
+        normalized: str,
+        value: Any,
+    ) -> None:
+        """Remove a pair known to be present below `root`."""
+        node = root
+        path = [node]
+        for ch in normalized:
+            node = self._writable_child(node, ch, owned, create=False)
+            path.append(node)
+
+        del node.entries[value]
+        node.is_terminal = bool(node.entries)
+
+        # Prune now-empty nodes bottom-up (never the root)
+        depth = len(normalized)
+        while depth > 0 and not path[depth].entries and not path[depth].children:
+            del path[depth - 1].children[normalized[depth - 1]]
+            depth -= 1
+
+        self._rebuild_tops(path[: depth + 1])
+
+    def replace(
+        self,
+        old_key: str,
+        new_key: str,
+        value: Any,
+        weight: Optional[float] = None,
+    ) -> None:
+        """
+        Move a value from old_key to new_key (e.g. when a course is renamed).
+
+        The move is published as one write, so concurrent readers see the
+        value under exactly one of the two keys.
+
+        Args:
+            weight: New ranking weight; None keeps the value's current weight.
+
+        Raises:
+            KeyError: if (old_key, value) is not in the trie.
+        """
+        if not isinstance(new_key, str):
+            raise TypeError("key must be a string")
+
+        with self._write_lock:
+            node = self._find_node(old_key)
+            entry = node.entries.get(value) if node is not None else None
+            if entry is None:
+                raise KeyError(f"Value {value!r} is not stored under key {old_key!r}.")
+
+            root, owned = self._begin_write()
+            self._remove_from(root, owned, self._normalize_key(old_key), value)
+            self._insert_into(
+                root,
+                owned,
+                self._normalize_key(new_key),
+                value,
+                -entry[0] if weight is None else weight,
+            )
+            self._publish(root)
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit/miss/eviction counters of the autocomplete cache."""
+        return CacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._cache),
+            maxsize=self._cache_size,
+        )
+
+    def cache_clear(self) -> None:
+        """Drop all cached autocomplete results and reset the counters."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def _rebuild_tops(self, path: List[TrieNode]) -> None:
+        """Recompute cached best-k lists bottom-up along a root-to-node path."""
+        for node in reversed(path):
+            self._finalize_top(node)
+
+    def _offer_top(self, node: TrieNode, entry: RankedEntry) -> None:
+        """Merge an entry into a node's cached best-k list if it qualifies."""
+        top = node.top
+        if len(top) < self._top_k:
+            bisect.insort(top, entry)
+        elif top and entry < top[-1]:
+            bisect.insort(top, entry)
+            top.pop()
 
     def _find_node(self, prefix: str) -> Optional[TrieNode]:
         """
@@ -87,35 +547,284 @@ class ContentTrie:
                 return None
         return node
 
-    def autocomplete(self, prefix: str) -> List[Any]:
+    def autocomplete(
+        self,
+        prefix: str,
+        limit: Optional[int] = None,
+        ranked: bool = False,
+    ) -> List[Any]:
         """
-        Return all values whose keys start with the given prefix.
+        Return values whose keys start with the given prefix.
+
+        Unranked results come back in key order (then insertion order within
+        a key), matching iter_autocomplete and FrozenTrie.
 
         Args:
             prefix: The prefix to search for.
                     If empty string, returns all values stored in the trie.
+            limit: Maximum number of values to return. Traversal stops as soon
+                   as this many values are found. None means no limit.
+            ranked: If True, return values ordered by descending weight.
+                    With limit <= top_k this is served from the cached best-k
+                    list of the prefix node in O(limit).
 
         Returns:
             A list of values associated with keys that share this prefix.
         """
-        # Special case: empty prefix -> everything
-        if prefix == "":
-            start_node = self._root
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be non-negative")
+        if limit == 0:
+            return []
+        if not self._cache_size:
+            return self._autocomplete(prefix, limit, ranked)
+
+        cache_key = (self._normalize_key(prefix), limit, ranked)
+        # Read the generation before the root: results computed from a newer
+        # root than the stamp suggests are merely treated as stale later.
+        generation = self._generation
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None and cached[0] == generation:
+                self._hits += 1
+                self._cache.move_to_end(cache_key)
+                return list(cached[1])
+            self._misses += 1
+
+        results = self._autocomplete(prefix, limit, ranked)
+        with self._cache_lock:
+            self._cache[cache_key] = (generation, tuple(results))
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+        return results
+
+    def _autocomplete(
+        self,
+        prefix: str,
+        limit: Optional[int],
+        ranked: bool,
+    ) -> List[Any]:
+        """Uncached autocomplete; arguments are already validated."""
+        if not ranked:
+            return list(itertools.islice(self.iter_autocomplete(prefix), limit))
+
+        start_node = self._find_node(prefix)
+        if start_node is None:
+            return []
+
+        if limit is not None and limit <= self._top_k:
+            return [value for _, _, value in start_node.top[:limit]]
+        entries = self._collect_entries(start_node)
+        if limit is None:
+            entries.sort()
         else:
-            start_node = self._find_node(prefix)
-            if start_node is None:
-                return []
+            entries = heapq.nsmallest(limit, entries)
+        return [value for _, _, value in entries]
 
-        collected: List[Any] = []
-        self._collect_values(start_node, collected)
-        return collected
+    def iter_autocomplete(
+        self,
+        prefix: str,
+        after: Optional[AutocompleteCursor] = None,
+    ) -> Iterator[Any]:
+        """
+        Lazily yield values whose keys start with the given prefix.
+
+        Uses an explicit stack, so arbitrarily long keys never hit the
+        recursion limit, and nothing is materialized up front. Values are
+        yielded in key order (then insertion order within a key).
 
-    def _collect_values(self, node: TrieNode, collected: List[Any]) -> None:
+        Args:
+            prefix: The prefix to search for; empty string yields everything.
+            after: Optional cursor from autocomplete_page; iteration resumes
+                   right after the value it points at.
         """
-        Depth-first traversal from the given node, collecting all values.
+        for _, _, value in self._iter_positions(prefix, after):
+            yield value
+
+    def autocomplete_page(
+        self,
+        prefix: str,
+        page_size: int = 50,
+        cursor: Optional[AutocompleteCursor] = None,
+    ) -> Tuple[List[Any], Optional[AutocompleteCursor]]:
         """
-        if node.is_terminal:
-            collected.extend(node.values)
+        Return one page of autocomplete results plus a cursor for the next page.
 
-        for child in node.children.values():
-            self._collect_values(child, collected)
+        Resuming from a cursor only walks the path of the last returned key,
+        not the part of the subtree that was already paged through.
+
+        Returns:
+            (values, next_cursor) where next_cursor is None once the results
+            are exhausted.
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+
+        positions = self._iter_positions(prefix, cursor)
+        page = list(itertools.islice(positions, page_size + 1))
+        if len(page) <= page_size:
+            return [value for _, _, value in page], None
+
+        page.pop()
+        key, offset, _ = page[-1]
+        next_cursor = AutocompleteCursor(
+            prefix=self._normalize_key(prefix),
+            key=key,
+            offset=offset + 1,
+        )
+        return [value for _, _, value in page], next_cursor
+
+    def _iter_positions(
+        self,
+        prefix: str,
+        after: Optional[AutocompleteCursor] = None,
+    ) -> Iterator[Tuple[str, int, Any]]:
+        """
+        Yield (normalized key, index within key, value) in key order.
+        """
+        normalized = self._normalize_key(prefix)
+        start_node = self._find_node(prefix)
+        if start_node is None:
+            return
+
+        # Stack of (node, key, first entry index to emit)
+        stack: List[Tuple[TrieNode, str, int]] = []
+        if after is None:
+            stack.append((start_node, normalized, 0))
+        else:
+            if after.prefix != normalized or not after.key.startswith(normalized):
+                raise ValueError("cursor does not belong to this prefix")
+            self._seed_resume_stack(start_node, normalized, after, stack)
+
+        while stack:
+            node, key, first = stack.pop()
+            for idx, value in enumerate(node.entries):
+                if idx >= first:
+                    yield key, idx, value
+            for ch in sorted(node.children, reverse=True):
+                stack.append((node.children[ch], key + ch, 0))
+
+    @staticmethod
+    def _seed_resume_stack(
+        node: TrieNode,
+        key: str,
+        after: AutocompleteCursor,
+        stack: List[Tuple[TrieNode, str, int]],
+    ) -> None:
+        """
+        Rebuild the traversal stack as it was right after `after` was emitted.
+
+        Only the cursor key's path is walked: at each level, the siblings that
+        sort after the path character are pushed (shallowest first, so deeper
+        ones are popped first). If the key was removed in the meantime, the
+        traversal simply continues with the next key in order.
+        """
+        for ch in after.key[len(key) :]:
+            for sibling in sorted(node.children, reverse=True):
+                if sibling <= ch:
+                    break
+                stack.append((node.children[sibling], key + sibling, 0))
+            child = node.children.get(ch)
+            if child is None:
+                return
+            node, key = child, key + ch
+        stack.append((node, key, after.offset))
+
+    def search_fuzzy(
+        self,
+        query: str,
+        max_edits: int = 1,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Return values whose full key is within `max_edits` edits of `query`.
+
+        Walks the trie computing one Levenshtein DP row per node, so the row
+        for a shared prefix is computed once. A branch is pruned as soon as
+        every cell of its row exceeds the edit budget. With a limit, the
+        budget tightens to the worst distance kept so far once `limit`
+        results are held, keeping latency predictable.
+
+        Args:
+            query: The (possibly misspelled) search string.
+            max_edits: Maximum Levenshtein distance (insert/delete/substitute).
+            limit: Maximum number of values to return. None means no limit.
+
+        Returns:
+            Values ordered by ascending edit distance, then key order.
+        """
+        if max_edits < 0:
+            raise ValueError("max_edits must be non-negative")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be non-negative")
+        if limit == 0:
+            return []
+
+        target = self._normalize_key(query)
+        first_row = list(range(len(target) + 1))
+
+        # Max-heap (via negation) of (distance, discovery order, value)
+        best: List[Tuple[int, int, Any]] = []
+        found = 0
+
+        stack: List[Tuple[TrieNode, List[int]]] = [(self._root, first_row)]
+        while stack:
+            node, row = stack.pop()
+
+            if limit is not None and len(best) == limit:
+                # Only strictly closer matches can still enter the results
+                budget = -best[0][0] - 1
+            else:
+                budget = max_edits
+            if min(row) > budget:
+                continue
+
+            distance = row[-1]
+            if node.entries and distance <= budget:
+                for value in node.entries:
+                    candidate = (-distance, -found, value)
+                    found += 1
+                    if limit is None or len(best) < limit:
+                        heapq.heappush(best, candidate)
+                    elif candidate > best[0]:
+                        heapq.heapreplace(best, candidate)
+
+            for ch in sorted(node.children, reverse=True):
+                next_row = [row[0] + 1]
+                for col in range(1, len(target) + 1):
+                    cost = 0 if target[col - 1] == ch else 1
+                    next_row.append(
+                        min(
+                            next_row[col - 1] + 1,
+                            row[col] + 1,
+                            row[col - 1] + cost,
+                        )
+                    )
+                if min(next_row) <= budget:
+                    stack.append((node.children[ch], next_row))
+
+        best.sort(reverse=True)
+        return [value for _, _, value in best]
+
+    def _collect_entries(self, node: TrieNode) -> List[RankedEntry]:
+        """
+        Depth-first traversal from the given node, collecting ranked entries.
+        """
+        collected: List[RankedEntry] = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            collected.extend(current.entries.values())
+            stack.extend(current.children.values())
+        return collected
+
+    def freeze(self) -> FrozenTrie:
+        """
+        Return an immutable, array-backed snapshot of this trie.
+
+        The snapshot can be saved to a binary file and memory-mapped by
+        other processes (see FrozenTrie.save / FrozenTrie.load). Weights
+        are not carried over; values must be JSON-serializable.
+        """
+        return FrozenTrie.from_root(self._root)
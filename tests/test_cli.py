@@ -0,0 +1,42 @@
+from cli.cli import LearningPlatformCLI
+from core.config import CONFIG
+from core.models.student import Student
+from core.search.radix_trie import RadixTrie
+
+
+def test_first_completion_reports_newly_unlocked_courses(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    cli = LearningPlatformCLI()
+    student = Student(id="s1", name="Ann", age=20, gender="F")
+    student.change_current_course("data_structures")
+    cli.student_service.add_student(student)
+    monkeypatch.setattr("builtins.input", lambda prompt="": "s1")
+
+    cli._complete_next_sequence()
+    first = capsys.readouterr().out
+    cli._complete_next_sequence()
+    second = capsys.readouterr().out
+
+    assert "Newly unlocked courses: algorithms" in first
+    assert "Newly unlocked" not in second
+
+
+def test_cli_starts_with_radix_search_backend(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(CONFIG, "search_backend", "radix")
+
+    cli = LearningPlatformCLI()
+
+    assert isinstance(cli.trie, RadixTrie)
+    assert "Data Structures" in cli.trie.autocomplete("data")
+
+
+def test_changed_search_config_rebuilds_instead_of_restoring(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    LearningPlatformCLI()
+    assert (tmp_path / CONFIG["snapshot_path"]).exists()
+
+    monkeypatch.setitem(CONFIG, "search_cache_size", 4)
+    cli = LearningPlatformCLI()
+
+    assert cli.trie.cache_info().maxsize == 4
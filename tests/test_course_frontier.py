@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+
+from core.graph.course_graph import CourseGraph
+from core.graph.frontier import CourseFrontier
+from core.models.course import Course
+from core.models.sequence import Sequence
+
+
+def make_course(course_id: str) -> Course:
+    course = Course(
+        id=course_id,
+        title=course_id.title().replace("_", " "),
+        description=f"Course {course_id}",
+        difficulty=1,
+    )
+    course.sequences.append(
+        Sequence(
+            id=f"{course_id}_seq1",
+            title="Intro",
+            duration=timedelta(minutes=30),
+            order=1,
+        )
+    )
+    return course
+
+
+def build_graph():
+    # ds -> alg -> adv, math -> alg
+    graph = CourseGraph()
+    courses = {}
+    for course_id in ["data_structures", "math", "algorithms", "advanced"]:
+        courses[course_id] = make_course(course_id)
+        graph.add_course(courses[course_id])
+    graph.add_prerequisite("data_structures", "algorithms")
+    graph.add_prerequisite("math", "algorithms")
+    graph.add_prerequisite("algorithms", "advanced")
+    return graph, courses
+
+
+def test_frontier_starts_with_courses_without_prerequisites():
+    graph, _ = build_graph()
+    frontier = CourseFrontier(graph)
+
+    assert sorted(frontier.eligible()) == ["data_structures", "math"]
+    assert not frontier.is_unlocked("algorithms")
+
+
+def test_mark_satisfied_unlocks_dependents_incrementally():
+    graph, _ = build_graph()
+    frontier = CourseFrontier(graph)
+
+    assert frontier.mark_satisfied("data_structures") == []
+    assert frontier.eligible() == ["math"]
+
+    assert frontier.mark_satisfied("math") == ["algorithms"]
+    assert frontier.eligible() == ["algorithms"]
+
+    # Satisfying twice is a no-op
+    assert frontier.mark_satisfied("math") == []
+
+    assert frontier.mark_satisfied("algorithms") == ["advanced"]
+    assert frontier.is_satisfied("algorithms")
+    assert frontier.eligible() == ["advanced"]
+
+
+def test_for_student_replays_completed_sequences():
+    graph, courses = build_graph()
+    frontier = CourseFrontier.for_student(
+        graph, courses, ["data_structures_seq1", "math_seq1"]
+    )
+
+    assert frontier.is_satisfied("math")
+    assert frontier.eligible() == ["algorithms"]
+
+
+def test_mark_satisfied_unknown_course_raises():
+    graph, _ = build_graph()
+    frontier = CourseFrontier(graph)
+
+    with pytest.raises(KeyError):
+        frontier.mark_satisfied("missing")
@@ -1,7 +1,10 @@
+from datetime import timedelta
+
 import pytest
 
 from core.graph.course_graph import CourseGraph
 from core.models.course import Course
+from core.models.sequence import Sequence
 
 
 def make_course(course_id: str, difficulty: int = 1) -> Course:
@@ -103,12 +106,15 @@ def test_topological_sort_cycle_detection():
     graph.add_course(a)
     graph.add_course(b)
 
-    # a -> b and b -> a creates a cycle
+    # a -> b and b -> a creates a cycle: rejected when the edge is added
     graph.add_prerequisite("a", "b")
-    graph.add_prerequisite("b", "a")
-
     with pytest.raises(ValueError):
-        _ = graph.topological_sort()
+        graph.add_prerequisite("b", "a")
+
+    # The rejected edge left no trace
+    assert graph.get_prerequisites("a") == set()
+    assert graph.in_degrees["a"] == 0
+    assert graph.topological_sort() == ["a", "b"]
 
 
 def test_add_content_appends_not_overwrites():
@@ -122,3 +128,396 @@ def test_add_content_appends_not_overwrites():
 
     content = graph.get_content("data_structures")
     assert content == ["Arrays", "Linked Lists", "Stacks"]
+
+
+def build_random_dag(seed: int, size: int = 30, edges: int = 60) -> CourseGraph:
+    import random
+
+    rng = random.Random(seed)
+    graph = CourseGraph()
+    for i in range(size):
+        graph.add_course(make_course(f"c{i}"))
+    for _ in range(edges):
+        a, b = sorted(rng.sample(range(size), 2))
+        graph.add_prerequisite(f"c{a}", f"c{b}")
+    return graph
+
+
+def bfs_prerequisites(graph: CourseGraph, course_id: str) -> set:
+    index, graph.closure_index = graph.closure_index, None
+    try:
+        return graph.find_all_prerequisites(course_id)
+    finally:
+        graph.closure_index = index
+
+
+def test_closure_index_matches_bfs_and_tracks_new_edges():
+    graph = build_random_dag(seed=3)
+    graph.enable_closure_index()
+
+    for course_id in graph.courses:
+        assert graph.find_all_prerequisites(course_id) == bfs_prerequisites(
+            graph, course_id
+        )
+
+    # Edges and courses added after enabling are maintained incrementally
+    graph.add_course(make_course("capstone"))
+    graph.add_prerequisite("c29", "capstone")
+    graph.add_prerequisite("c0", "c1")
+    for course_id in graph.courses:
+        assert graph.find_all_prerequisites(course_id) == bfs_prerequisites(
+            graph, course_id
+        )
+
+
+def test_is_prerequisite_with_and_without_index():
+    graph = CourseGraph()
+    for cid in ("ds", "alg", "adv", "math"):
+        graph.add_course(make_course(cid))
+    graph.add_prerequisite("ds", "alg")
+    graph.add_prerequisite("alg", "adv")
+
+    for enabled in (False, True):
+        if enabled:
+            graph.enable_closure_index()
+        assert graph.is_prerequisite("ds", "adv") is True
+        assert graph.is_prerequisite("adv", "ds") is False
+        assert graph.is_prerequisite("math", "adv") is False
+
+    with pytest.raises(KeyError):
+        graph.is_prerequisite("ds", "unknown")
+
+
+def assert_valid_order(graph: CourseGraph) -> None:
+    order = graph.topological_sort()
+    assert sorted(order) == sorted(graph.courses)
+    position = {course_id: i for i, course_id in enumerate(order)}
+    for prereq, dependents in graph.graph.items():
+        for dependent in dependents:
+            assert position[prereq] < position[dependent]
+
+
+def test_topological_order_is_maintained_incrementally():
+    import random
+
+    rng = random.Random(11)
+    graph = CourseGraph()
+    ids = [f"c{i}" for i in range(40)]
+    for cid in ids:
+        graph.add_course(make_course(cid))
+
+    # Edges follow a hidden ranking but arrive in random order, so most of
+    # them point "backwards" in the insertion order and force reorders.
+    hidden_rank = {cid: r for r, cid in enumerate(rng.sample(ids, len(ids)))}
+    for _ in range(120):
+        a, b = rng.sample(ids, 2)
+        if hidden_rank[a] > hidden_rank[b]:
+            a, b = b, a
+        graph.add_prerequisite(a, b)
+        assert_valid_order(graph)
+
+
+def test_transitive_cycle_rejected_and_self_loop_rejected():
+    graph = CourseGraph()
+    for cid in ("a", "b", "c"):
+        graph.add_course(make_course(cid))
+    graph.add_prerequisite("a", "b")
+    graph.add_prerequisite("b", "c")
+
+    with pytest.raises(ValueError):
+        graph.add_prerequisite("c", "a")
+    with pytest.raises(ValueError):
+        graph.add_prerequisite("b", "b")
+    assert graph.topological_sort() == ["a", "b", "c"]
+
+
+def test_graph_built_from_existing_maps_gets_an_order():
+    courses = {cid: make_course(cid) for cid in ("x", "y")}
+    graph = CourseGraph(
+        courses=courses,
+        graph={"x": set(), "y": {"x"}},
+        reverse_graph={"x": {"y"}, "y": set()},
+        in_degrees={"x": 1, "y": 0},
+    )
+    assert graph.topological_sort() == ["y", "x"]
+
+
+def make_course_with_minutes(course_id: str, *minutes: int) -> Course:
+    course = make_course(course_id)
+    for i, length in enumerate(minutes, start=1):
+        course.sequences.append(
+            Sequence(
+                id=f"{course_id}_{i}",
+                title=f"Part {i}",
+                duration=timedelta(minutes=length),
+                order=i,
+            )
+        )
+    return course
+
+
+def build_plan_graph() -> CourseGraph:
+    # intro -> ds -> alg, intro -> math -> alg, alg -> adv
+    graph = CourseGraph()
+    graph.add_course(make_course_with_minutes("intro", 30))
+    graph.add_course(make_course_with_minutes("ds", 60, 60))
+    graph.add_course(make_course_with_minutes("math", 45))
+    graph.add_course(make_course_with_minutes("alg", 90))
+    graph.add_course(make_course_with_minutes("adv", 20))
+    graph.add_prerequisite("intro", "ds")
+    graph.add_prerequisite("intro", "math")
+    graph.add_prerequisite("ds", "alg")
+    graph.add_prerequisite("math", "alg")
+    graph.add_prerequisite("alg", "adv")
+    return graph
+
+
+def test_plan_to_computes_total_and_critical_path():
+    graph = build_plan_graph()
+
+    plan = graph.plan_to("alg")
+
+    assert plan.courses[0] == "intro"
+    assert set(plan.courses) == {"intro", "ds", "math", "alg"}
+    assert plan.total_duration == timedelta(minutes=30 + 120 + 45 + 90)
+    # ds (120 min) dominates math (45 min) among the parallel prerequisites
+    assert plan.critical_path == ("intro", "ds", "alg")
+    assert plan.critical_duration == timedelta(minutes=30 + 120 + 90)
+
+
+def test_plan_to_skips_completed_sequences():
+    graph = build_plan_graph()
+
+    plan = graph.plan_to("alg", completed={"intro_1", "ds_1", "ds_2"})
+
+    assert "intro" not in plan.courses and "ds" not in plan.courses
+    assert plan.total_duration == timedelta(minutes=45 + 90)
+    assert plan.critical_path == ("math", "alg")
+    assert plan.critical_duration == timedelta(minutes=45 + 90)
+
+
+def test_plan_many_matches_individual_plans():
+    graph = build_plan_graph()
+    graph.enable_closure_index()
+    completed = {"math_1"}
+
+    plans = graph.plan_many(["adv", "math", "ds"], completed)
+
+    assert set(plans) == {"adv", "math", "ds"}
+    for course_id, plan in plans.items():
+        assert plan == graph.plan_to(course_id, completed)
+    assert plans["math"].courses == ("intro",)
+    assert plans["adv"].critical_duration == timedelta(minutes=30 + 120 + 90 + 20)
+
+
+def test_plan_many_shares_one_pass_instead_of_bfs_per_target(monkeypatch):
+    graph = build_plan_graph()
+    expected = {
+        course_id: graph.find_all_prerequisites(course_id) | {course_id}
+        for course_id in ["adv", "math", "ds", "intro"]
+    }
+
+    def no_bfs(course_id):
+        raise AssertionError("plan_many must not run a BFS per target")
+
+    monkeypatch.setattr(graph, "find_all_prerequisites", no_bfs)
+    plans = graph.plan_many(["adv", "math", "ds", "intro", "math"])
+
+    assert list(plans) == ["adv", "math", "ds", "intro"]
+    for course_id, plan in plans.items():
+        assert set(plan.courses) == expected[course_id]
+        assert list(plan.courses) == [
+            c for c in graph.topological_sort() if c in expected[course_id]
+        ]
+
+
+def test_plan_to_unknown_course_raises():
+    graph = build_plan_graph()
+
+    with pytest.raises(KeyError):
+        graph.plan_to("missing")
+
+
+def test_remove_prerequisite_updates_maps_and_closure():
+    graph = build_plan_graph()
+    graph.enable_closure_index()
+
+    graph.remove_prerequisite("ds", "alg")
+
+    assert "alg" not in graph.graph["ds"]
+    assert graph.get_prerequisites("alg") == {"math"}
+    assert graph.in_degrees["alg"] == 1
+    assert graph.find_all_prerequisites("adv") == {"intro", "math", "alg"}
+    assert not graph.is_prerequisite("ds", "adv")
+
+    with pytest.raises(KeyError):
+        graph.remove_prerequisite("ds", "alg")
+
+
+def test_remove_course_drops_edges_content_and_order():
+    graph = build_plan_graph()
+    graph.enable_closure_index()
+    graph.add_content("alg", "sorting")
+
+    graph.remove_course("alg")
+
+    assert "alg" not in graph.courses
+    assert "alg" not in graph.course_content
+    assert "alg" not in graph.graph["ds"] and "alg" not in graph.graph["math"]
+    assert graph.in_degrees["adv"] == 0
+    assert graph.find_all_prerequisites("adv") == set()
+    assert "alg" not in graph.topological_sort()
+    assert_valid_order(graph)
+
+    with pytest.raises(KeyError):
+        graph.remove_course("alg")
+
+
+def test_random_removals_keep_closure_and_order_consistent():
+    import random
+
+    rng = random.Random(5)
+    graph = build_random_dag(seed=8, size=40, edges=100)
+    graph.enable_closure_index()
+
+    for step in range(30):
+        if step % 3 == 0:
+            graph.remove_course(rng.choice(sorted(graph.courses)))
+        else:
+            edges = sorted((p, c) for p, deps in graph.graph.items() for c in deps)
+            graph.remove_prerequisite(*rng.choice(edges))
+
+        assert_valid_order(graph)
+        for course_id in graph.courses:
+            assert graph.find_all_prerequisites(course_id) == bfs_prerequisites(
+                graph, course_id
+            )
+
+    # Removing most courses compacts the holes left in the order
+    while len(graph.courses) > 10:
+        graph.remove_course(rng.choice(sorted(graph.courses)))
+    assert len(graph._topo_slots) <= 2 * len(graph.courses)
+    assert_valid_order(graph)
+
+    graph.add_course(make_course("late"))
+    graph.add_prerequisite("late", sorted(graph.courses)[0])
+    assert_valid_order(graph)
+
+
+def test_remove_content():
+    graph = build_plan_graph()
+    graph.add_content("ds", "arrays")
+    graph.add_content("ds", "lists")
+
+    graph.remove_content("ds", "arrays")
+
+    assert graph.get_content("ds") == ["lists"]
+    with pytest.raises(ValueError):
+        graph.remove_content("ds", "arrays")
+
+
+def test_topological_layers_are_antichains():
+    graph = build_plan_graph()
+
+    layers = graph.topological_layers()
+
+    assert layers == [["intro"], sorted(layers[1]), ["alg"], ["adv"]]
+    assert set(layers[1]) == {"ds", "math"}
+
+    random_graph = build_random_dag(seed=4)
+    depth = {
+        course_id: level
+        for level, layer in enumerate(random_graph.topological_layers())
+        for course_id in layer
+    }
+    assert sorted(depth) == sorted(random_graph.courses)
+    for prereq, dependents in random_graph.graph.items():
+        for dependent in dependents:
+            assert depth[prereq] < depth[dependent]
+
+
+def test_map_layers_runs_prerequisites_first():
+    from concurrent.futures import ThreadPoolExecutor
+
+    graph = build_random_dag(seed=6)
+    finished = set()
+
+    def record(course_id):
+        assert graph.get_prerequisites(course_id) <= finished
+        finished.add(course_id)
+        return course_id.upper()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = graph.map_layers(record, executor=pool)
+    assert results == {course_id: course_id.upper() for course_id in graph.courses}
+
+    finished.clear()
+    assert graph.map_layers(record, max_workers=2) == results
+
+
+def test_content_is_deduplicated_and_reverse_indexed():
+    graph = build_plan_graph()
+    graph.add_content("ds", "arrays")
+    graph.add_content("ds", "lists")
+    graph.add_content("ds", "arrays")
+    graph.add_content("alg", "arrays")
+
+    assert graph.get_content("ds") == ["arrays", "lists"]
+    assert graph.courses_with_content("arrays") == {"ds", "alg"}
+    assert graph.courses_with_content("unknown") == set()
+
+    graph.remove_content("ds", "arrays")
+    assert graph.courses_with_content("arrays") == {"alg"}
+
+    graph.remove_course("alg")
+    assert graph.courses_with_content("arrays") == set()
+    assert graph.courses_with_content("lists") == {"ds"}
+
+
+def test_content_index_built_from_constructor_lists():
+    course = make_course("ds")
+    graph = CourseGraph(
+        courses={"ds": course},
+        graph={"ds": set()},
+        reverse_graph={"ds": set()},
+        in_degrees={"ds": 0},
+        course_content={"ds": ["arrays", "lists", "arrays"]},
+    )
+
+    assert graph.get_content("ds") == ["arrays", "lists"]
+    assert graph.courses_with_content("lists") == {"ds"}
+
+
+@pytest.mark.parametrize("with_index", [False, True])
+def test_batch_prerequisite_queries_match_per_course_bfs(with_index):
+    import random
+
+    rng = random.Random(21)
+    graph = build_random_dag(seed=13, size=50, edges=120)
+    if with_index:
+        graph.enable_closure_index()
+
+    for _ in range(20):
+        chosen = rng.sample(sorted(graph.courses), rng.randint(1, 8))
+        closures = {c: bfs_prerequisites(graph, c) for c in chosen}
+
+        assert graph.union_prerequisites(chosen) == set().union(*closures.values())
+        assert graph.shared_prerequisites(chosen) == set.intersection(
+            *closures.values()
+        )
+        assert graph.covering_courses(chosen) == {
+            c for c in chosen if not any(c in closures[o] for o in chosen)
+        }
+
+
+def test_batch_prerequisite_queries_on_plan_graph():
+    graph = build_plan_graph()
+
+    assert graph.shared_prerequisites(["ds", "math"]) == {"intro"}
+    assert graph.shared_prerequisites(["adv", "math"]) == {"intro"}
+    assert graph.union_prerequisites(["ds", "math"]) == {"intro"}
+    assert graph.covering_courses(["intro", "ds", "adv", "math"]) == {"adv"}
+    assert graph.shared_prerequisites([]) == set()
+
+    with pytest.raises(KeyError):
+        graph.union_prerequisites(["ds", "missing"])
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from core.graph.course_graph import CourseGraph
+from core.graph.csr import CSRGraph
+from core.models.course import Course
+
+
+def make_graph(seed: int = 5, size: int = 25, edges: int = 50) -> CourseGraph:
+    rng = random.Random(seed)
+    graph = CourseGraph()
+    for i in range(size):
+        graph.add_course(Course(id=f"c{i}", title=f"C{i}", description=""))
+    for _ in range(edges):
+        a, b = sorted(rng.sample(range(size), 2))
+        graph.add_prerequisite(f"c{a}", f"c{b}")
+    return graph
+
+
+def test_csr_queries_match_course_graph():
+    graph = make_graph()
+    csr = graph.to_csr()
+
+    assert len(csr) == 25
+    assert csr.edge_count == sum(len(d) for d in graph.graph.values())
+    for course_id in graph.courses:
+        assert csr.prerequisites(course_id) == graph.get_prerequisites(course_id)
+        assert csr.ancestors(course_id) == graph.find_all_prerequisites(course_id)
+        assert course_id not in csr.descendants(course_id)
+
+
+def test_csr_topological_sort_and_closure():
+    graph = make_graph(seed=9)
+    csr = graph.to_csr()
+
+    order = csr.topological_sort()
+    position = {cid: i for i, cid in enumerate(order)}
+    for prereq, dependents in graph.graph.items():
+        for dependent in dependents:
+            assert position[prereq] < position[dependent]
+
+    bits = csr.ancestor_bitsets()
+    for course_id in graph.courses:
+        decoded = {
+            csr.ids[i] for i in range(len(csr)) if bits[csr.index[course_id]] >> i & 1
+        }
+        assert decoded == graph.find_all_prerequisites(course_id)
+
+
+def test_csr_save_and_load_roundtrip(tmp_path):
+    csr = make_graph().to_csr()
+    path = tmp_path / "graph.csr"
+    csr.save(str(path))
+
+    loaded = CSRGraph.load(str(path))
+    assert loaded.ids == csr.ids
+    assert loaded.fwd_targets == csr.fwd_targets
+    assert loaded.rev_offsets == csr.rev_offsets
+    assert loaded.ancestors("c24") == csr.ancestors("c24")
+
+
+def test_csr_rejects_bad_data_and_unknown_courses():
+    csr = make_graph().to_csr()
+    with pytest.raises(ValueError):
+        CSRGraph.from_bytes(csr.to_bytes()[:-1])
+    with pytest.raises(KeyError):
+        csr.ancestors("missing")
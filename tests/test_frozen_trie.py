@@ -0,0 +1,50 @@
+import pytest
+
+from core.search.frozen_trie import FrozenTrie
+from core.search.trie import ContentTrie
+
+
+def build_trie() -> ContentTrie:
+    trie = ContentTrie()
+    trie.insert("Arrays", "Arrays - Intro")
+    trie.insert("arraylist", "ArrayList - Dynamic")
+    trie.insert("linked lists", "Linked Lists")
+    trie.insert("dp", 1)
+    trie.insert("dp", 2)
+    return trie
+
+
+def test_freeze_matches_live_trie():
+    trie = build_trie()
+    frozen = trie.freeze()
+
+    assert len(frozen) == 5
+    for prefix in ["", "a", "ARR", "arrays", "l", "dp", "graph"]:
+        assert sorted(map(str, frozen.autocomplete(prefix))) == sorted(
+            map(str, trie.autocomplete(prefix))
+        )
+
+
+def test_frozen_results_are_in_key_order_with_limit():
+    frozen = build_trie().freeze()
+
+    assert frozen.autocomplete("arr") == ["ArrayList - Dynamic", "Arrays - Intro"]
+    assert frozen.autocomplete("", limit=2) == [
+        "ArrayList - Dynamic",
+        "Arrays - Intro",
+    ]
+    assert frozen.autocomplete("dp", limit=1) == [1]
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    path = tmp_path / "search.idx"
+    build_trie().freeze().save(str(path))
+
+    with FrozenTrie.load(str(path)) as frozen:
+        assert frozen.autocomplete("linked") == ["Linked Lists"]
+        assert len(frozen.autocomplete("")) == 5
+
+
+def test_from_buffer_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        FrozenTrie.from_buffer(b"not a trie snapshot at all, honestly!!")
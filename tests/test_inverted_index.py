@@ -0,0 +1,46 @@
+import pytest
+
+from core.search.inverted_index import InvertedIndex
+
+
+def build_index() -> InvertedIndex:
+    index = InvertedIndex()
+    index.add_document("Linked Lists", "Linked Lists", "Nodes and pointers")
+    index.add_document("Array Lists", "Array Lists", "Dynamic arrays")
+    index.add_document("Graph Algorithms", "Graph Algorithms", "BFS and DFS")
+    index.add_document("Sorting", "Sorting Algorithms")
+    return index
+
+
+def test_mid_title_token_is_found():
+    index = build_index()
+
+    assert index.search("lists") == ["Linked Lists", "Array Lists"]
+    assert index.search("pointers") == ["Linked Lists"]
+    assert len(index) == 4
+
+
+def test_token_prefix_matching():
+    index = build_index()
+
+    assert index.search("alg") == ["Graph Algorithms", "Sorting"]
+    assert index.search("alg", prefix=False) == []
+    assert index.search("array") == ["Array Lists"]
+
+
+def test_and_or_modes_intersect_and_union_postings():
+    index = build_index()
+
+    assert index.search("lists dyn") == ["Array Lists"]
+    assert index.search("graph sort", mode="and") == []
+    assert index.search("graph sort", mode="or") == ["Graph Algorithms", "Sorting"]
+    assert index.search_ids("LISTS", mode="or") == [0, 1]
+
+
+def test_empty_query_and_invalid_mode():
+    index = build_index()
+
+    assert index.search("  ") == []
+    assert index.search("missing") == []
+    with pytest.raises(ValueError):
+        index.search("lists", mode="xor")
@@ -0,0 +1,63 @@
+import random
+
+from core.search.radix_trie import RadixTrie
+from core.search.trie import ContentTrie
+
+
+def test_insert_and_autocomplete_basic():
+    trie = RadixTrie()
+    trie.insert("arrays", "Arrays - Intro")
+    trie.insert("arraylist", "ArrayList - Dynamic")
+    trie.insert("linked lists", "Linked Lists - Intro")
+
+    results = trie.autocomplete("arr")
+    assert sorted(results) == ["ArrayList - Dynamic", "Arrays - Intro"]
+    assert trie.autocomplete("graph") == []
+
+
+def test_prefix_ending_inside_edge_label():
+    trie = RadixTrie()
+    trie.insert("dynamic programming", "DP")
+
+    assert trie.autocomplete("dyn") == ["DP"]
+    assert trie.autocomplete("dynamic prog") == ["DP"]
+    assert trie.autocomplete("dynamo") == []
+
+
+def test_edge_split_keeps_shorter_key():
+    trie = RadixTrie()
+    trie.insert("sorting", "Sorting Algorithms")
+    trie.insert("sort", "Sorting - Overview")
+    trie.insert("search", "Searching Algorithms")
+
+    assert sorted(trie.autocomplete("sort")) == [
+        "Sorting - Overview",
+        "Sorting Algorithms",
+    ]
+    assert trie.autocomplete("sorti") == ["Sorting Algorithms"]
+    assert len(trie.autocomplete("")) == 3
+
+
+def test_case_insensitive_limit_and_ranking():
+    trie = RadixTrie()
+    trie.insert("Graphs", "Graphs", weight=1)
+    trie.insert("GRAPH theory", "Graph Theory", weight=10)
+    trie.insert("greedy", "Greedy", weight=5)
+
+    assert trie.autocomplete("gR", ranked=True) == ["Graph Theory", "Greedy", "Graphs"]
+    assert trie.autocomplete("graph", limit=1, ranked=True) == ["Graph Theory"]
+    assert len(trie.autocomplete("g", limit=2)) == 2
+
+
+def test_matches_content_trie_on_random_keys():
+    rng = random.Random(7)
+    words = ["array", "arrays", "graph", "greedy", "heap", "hash", "tree", "trie"]
+    radix = RadixTrie()
+    plain = ContentTrie()
+    for i in range(300):
+        key = " ".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+        radix.insert(key, i)
+        plain.insert(key, i)
+
+    for prefix in ["", "a", "arr", "array ", "g", "gre", "h", "tr", "trie t", "x"]:
+        assert sorted(radix.autocomplete(prefix)) == sorted(plain.autocomplete(prefix))
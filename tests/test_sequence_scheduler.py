@@ -1,5 +1,8 @@
+import random
 from datetime import timedelta
 
+import pytest
+
 from core.scheduling.sequence_scheduler import SequenceScheduler, SequenceTask
 
 
@@ -108,3 +111,286 @@ def test_update_priority_changes_order():
 
     assert (first.course_id, first.sequence_id) == ("algorithms", "seq1")
     assert (second.course_id, second.sequence_id) == ("data_structures", "seq1")
+
+
+def test_update_priority_keeps_fifo_order():
+    scheduler = SequenceScheduler()
+
+    scheduler.schedule(make_task("algorithms", "seq1", priority=5))
+    scheduler.schedule(make_task("data_structures", "seq1", priority=1))
+    scheduler.schedule(make_task("algorithms", "seq2", priority=5))
+
+    # Demote and promote again: algorithms keeps its original insertion order
+    scheduler.update_priority("algorithms", new_priority=9)
+    scheduler.update_priority("algorithms", new_priority=1)
+
+    ids = [(t.course_id, t.sequence_id) for t in scheduler.list_scheduled()]
+    assert ids == [
+        ("algorithms", "seq1"),
+        ("data_structures", "seq1"),
+        ("algorithms", "seq2"),
+    ]
+
+
+def test_remove_and_update_single_task():
+    scheduler = SequenceScheduler()
+    scheduler.schedule(make_task("data_structures", "seq1", priority=2))
+    scheduler.schedule(make_task("data_structures", "seq2", priority=2))
+    scheduler.schedule(make_task("algorithms", "seq1", priority=3))
+
+    scheduler.update_task_priority("algorithms", "seq1", new_priority=1)
+    removed = scheduler.remove("data_structures", "seq1")
+
+    assert removed.sequence_id == "seq1"
+    assert len(scheduler) == 2
+    assert scheduler.dequeue_next().course_id == "algorithms"
+    assert scheduler.dequeue_next().sequence_id == "seq2"
+    assert scheduler.dequeue_next() is None
+
+    with pytest.raises(KeyError):
+        scheduler.remove("data_structures", "seq1")
+    with pytest.raises(KeyError):
+        scheduler.update_task_priority("algorithms", "seq1", new_priority=0)
+
+
+def test_random_operations_match_sorted_model():
+    rng = random.Random(17)
+    scheduler = SequenceScheduler()
+    model = {}  # (course_id, sequence_id) -> (priority, insertion order)
+    inserted = 0
+
+    for _ in range(2000):
+        op = rng.random()
+        course_id = f"c{rng.randrange(10)}"
+        key = (course_id, f"s{rng.randrange(20)}")
+        if op < 0.4:
+            priority = rng.randrange(5)
+            scheduler.schedule(make_task(*key, priority=priority))
+            model[key] = (priority, inserted)
+            inserted += 1
+        elif op < 0.6 and key in model:
+            priority = rng.randrange(5)
+            scheduler.update_task_priority(*key, new_priority=priority)
+            model[key] = (priority, model[key][1])
+        elif op < 0.7:
+            priority = rng.randrange(5)
+            scheduler.update_priority(course_id, new_priority=priority)
+            for k in model:
+                if k[0] == course_id:
+                    model[k] = (priority, model[k][1])
+        elif op < 0.8:
+            removed = scheduler.dequeue_by_course(course_id)
+            expected = sorted(k for k in model if k[0] == course_id)
+            assert sorted((t.course_id, t.sequence_id) for t in removed) == expected
+            for k in expected:
+                del model[k]
+        elif op < 0.9:
+            task = scheduler.dequeue_next_for(course_id)
+            own = [k for k in model if k[0] == course_id]
+            if not own:
+                assert task is None
+                continue
+            best = min(own, key=model.__getitem__)
+            assert (task.course_id, task.sequence_id) == best
+            del model[best]
+        else:
+            task = scheduler.dequeue_next()
+            if not model:
+                assert task is None
+                continue
+            best = min(model, key=model.__getitem__)
+            assert (task.course_id, task.sequence_id) == best
+            del model[best]
+
+        assert len(scheduler) == len(model)
+
+    expected_order = sorted(model, key=model.__getitem__)
+    assert [
+        (t.course_id, t.sequence_id) for t in scheduler.list_scheduled()
+    ] == expected_order
+    assert len(scheduler._heap) <= 2 * len(model) + 32
+
+
+def test_rescheduling_a_removed_task_keeps_heap_order():
+    scheduler = SequenceScheduler()
+    for course_id, sequence_id in [("c1", "a"), ("c2", "b"), ("c3", "c")]:
+        scheduler.schedule(make_task(course_id, sequence_id, priority=1))
+
+    scheduler.schedule(scheduler.remove("c1", "a"))
+
+    assert scheduler.peek().sequence_id == "b"
+    assert [t.sequence_id for t in scheduler.list_scheduled()] == ["b", "c", "a"]
+    assert len(scheduler) == 3
+
+
+def test_dequeue_next_for_course_keeps_other_courses_in_order():
+    scheduler = SequenceScheduler()
+    scheduler.schedule(make_task("data_structures", "seq1", priority=1))
+    scheduler.schedule(make_task("algorithms", "seq1", priority=3))
+    scheduler.schedule(make_task("data_structures", "seq2", priority=1))
+    scheduler.schedule(make_task("algorithms", "seq2", priority=2))
+
+    assert scheduler.peek_for("algorithms").sequence_id == "seq2"
+    assert scheduler.dequeue_next_for("algorithms").sequence_id == "seq2"
+    assert scheduler.peek_for("algorithms").sequence_id == "seq1"
+    assert scheduler.peek_for("graphs") is None
+    assert scheduler.dequeue_next_for("graphs") is None
+
+    ids = [(t.course_id, t.sequence_id) for t in scheduler.list_scheduled()]
+    assert ids == [
+        ("data_structures", "seq1"),
+        ("data_structures", "seq2"),
+        ("algorithms", "seq1"),
+    ]
+
+
+def test_per_course_queues_skip_updated_and_removed_tasks():
+    scheduler = SequenceScheduler()
+    for i in range(5):
+        scheduler.schedule(make_task("algorithms", f"seq{i}", priority=5))
+
+    scheduler.update_task_priority("algorithms", "seq3", new_priority=1)
+    scheduler.remove("algorithms", "seq3")
+    assert scheduler.dequeue_next().sequence_id == "seq0"
+
+    order = []
+    while scheduler.peek_for("algorithms") is not None:
+        order.append(scheduler.dequeue_next_for("algorithms").sequence_id)
+    assert order == ["seq1", "seq2", "seq4"]
+    assert scheduler.is_empty()
+
+
+def test_requeued_task_keeps_course_queue_order():
+    scheduler = SequenceScheduler()
+    scheduler.schedule(make_task("algorithms", "a", priority=1))
+    scheduler.schedule(make_task("algorithms", "b", priority=1))
+
+    # dequeue_next leaves a stale entry in the course heap
+    scheduler.schedule(scheduler.dequeue_next())
+    assert scheduler.peek_for("algorithms").sequence_id == "b"
+
+    # dequeue_next_for leaves a stale entry in the global heap
+    scheduler.schedule(scheduler.dequeue_next_for("algorithms"))
+    assert [t.sequence_id for t in scheduler.list_scheduled()] == ["a", "b"]
+    assert scheduler.peek_for("algorithms").sequence_id == "a"
+
+
+def test_peek_and_peek_k_do_not_remove_tasks():
+    scheduler = SequenceScheduler()
+    assert scheduler.peek() is None
+    assert scheduler.peek_k(3) == []
+
+    scheduler.schedule(make_task("algorithms", "seq1", priority=3))
+    scheduler.schedule(make_task("data_structures", "seq1", priority=1))
+    scheduler.schedule(make_task("data_structures", "seq2", priority=1))
+    scheduler.update_task_priority("algorithms", "seq1", new_priority=0)
+
+    assert scheduler.peek().course_id == "algorithms"
+    assert [(t.course_id, t.sequence_id) for t in scheduler.peek_k(2)] == [
+        ("algorithms", "seq1"),
+        ("data_structures", "seq1"),
+    ]
+    assert len(scheduler) == 3
+    assert scheduler.dequeue_next().course_id == "algorithms"
+
+    with pytest.raises(ValueError):
+        scheduler.peek_k(-1)
+
+
+def test_iter_scheduled_matches_dequeue_order():
+    rng = random.Random(3)
+    scheduler = SequenceScheduler()
+    for i in range(300):
+        scheduler.schedule(make_task(f"c{i % 7}", f"s{i}", priority=rng.randrange(6)))
+    for i in range(0, 300, 4):
+        scheduler.update_task_priority(f"c{i % 7}", f"s{i}", rng.randrange(6))
+    scheduler.dequeue_by_course("c3")
+
+    heap_before = list(scheduler._heap)
+    listed = list(scheduler.iter_scheduled())
+    assert scheduler._heap == heap_before
+
+    dequeued = []
+    while not scheduler.is_empty():
+        dequeued.append(scheduler.dequeue_next())
+    assert listed == dequeued
+
+
+def test_schedule_many_matches_repeated_schedule():
+    rng = random.Random(9)
+    specs = [(f"c{rng.randrange(5)}", f"s{i}", rng.randrange(4)) for i in range(200)]
+
+    one_by_one = SequenceScheduler()
+    for spec in specs:
+        one_by_one.schedule(make_task(*spec))
+    bulk = SequenceScheduler()
+    count = bulk.schedule_many(make_task(*spec) for spec in specs)
+
+    def ids(tasks):
+        return [(t.course_id, t.sequence_id) for t in tasks]
+
+    assert count == len(specs)
+    assert ids(bulk.list_scheduled()) == ids(one_by_one.list_scheduled())
+    assert ids([bulk.peek_for("c2")]) == ids([one_by_one.peek_for("c2")])
+
+
+def test_schedule_many_appends_after_existing_tasks():
+    scheduler = SequenceScheduler()
+    scheduler.schedule(make_task("algorithms", "seq1", priority=2))
+
+    scheduler.schedule_many(
+        [
+            make_task("algorithms", "seq2", priority=2),
+            make_task("data_structures", "seq1", priority=1),
+        ]
+    )
+
+    assert scheduler.schedule_many([]) == 0
+    assert scheduler.dequeue_next_for("algorithms").sequence_id == "seq1"
+    assert [t.sequence_id for t in scheduler.list_scheduled()] == ["seq1", "seq2"]
+    assert scheduler.peek().course_id == "data_structures"
+
+
+def test_schedule_many_failing_stream_leaves_scheduler_unchanged():
+    scheduler = SequenceScheduler()
+    scheduler.schedule(make_task("algorithms", "seq1", priority=2))
+
+    def stream():
+        yield make_task("data_structures", "seq1", priority=1)
+        yield make_task("data_structures", "seq2", priority=1)
+        raise IOError("catalog read failed")
+
+    with pytest.raises(IOError):
+        scheduler.schedule_many(stream())
+
+    assert len(scheduler) == 1
+    assert scheduler.peek_for("data_structures") is None
+    assert scheduler.dequeue_next().course_id == "algorithms"
+    assert scheduler.is_empty()
+
+
+def test_schedule_many_rejects_non_tasks_without_changing_state():
+    scheduler = SequenceScheduler()
+    scheduler.schedule(make_task("algorithms", "seq1", priority=2))
+
+    with pytest.raises(TypeError):
+        scheduler.schedule_many(
+            [make_task("data_structures", "seq1", priority=1), ("graphs", "seq1")]
+        )
+
+    assert len(scheduler) == 1
+    assert scheduler.peek_for("data_structures") is None
+    assert [t.sequence_id for t in scheduler.list_scheduled()] == ["seq1"]
+
+
+def test_schedule_many_requeues_removed_tasks_in_order():
+    scheduler = SequenceScheduler()
+    scheduler.schedule_many(
+        make_task("algorithms", sequence_id, priority=1) for sequence_id in "abc"
+    )
+
+    scheduler.schedule_many([scheduler.remove("algorithms", "a")])
+
+    assert [t.sequence_id for t in scheduler.list_scheduled()] == ["b", "c", "a"]
+    assert scheduler.peek_for("algorithms").sequence_id == "b"
+    assert len(scheduler) == 3
@@ -0,0 +1,127 @@
+import sys
+from datetime import timedelta
+from types import SimpleNamespace
+
+from core.graph.course_graph import CourseGraph
+from core.models.sequence import Sequence
+from core.persistence import snapshot as snapshot_module
+from core.persistence.snapshot import (
+    PlatformSnapshot,
+    load_snapshot,
+    save_snapshot,
+)
+from core.persistence.storage import seed_example_data
+from core.scheduling.student_scheduler import StudentScheduler
+from core.search.inverted_index import InvertedIndex
+from core.search.trie import ContentTrie
+
+
+def build_snapshot() -> PlatformSnapshot:
+    courses = seed_example_data()
+    graph = CourseGraph()
+    trie = ContentTrie(cache_size=8)
+    index = InvertedIndex()
+    scheduler = StudentScheduler()
+    for course in courses.values():
+        graph.add_course(course)
+        trie.insert(course.title, course.id)
+        index.add_document(course.id, course.title, course.description)
+        scheduler.add_course(course)
+    scheduler.complete("s1", "data_structures", "ds_arrays")
+    graph.add_prerequisite("data_structures", "algorithms")
+    graph.enable_closure_index()
+    trie.autocomplete("data")  # populate the result cache
+    return PlatformSnapshot(courses, graph, trie, index, scheduler)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "platform.snapshot")
+    original = build_snapshot()
+
+    save_snapshot(path, original)
+    restored = load_snapshot(path, seed_example_data())
+
+    assert restored is not None
+    assert restored.course_graph.topological_sort() == [
+        "data_structures",
+        "algorithms",
+    ]
+    assert restored.course_graph.is_prerequisite("data_structures", "algorithms")
+    assert restored.trie.cache_info().size == 0
+    assert restored.trie.autocomplete("alg") == ["algorithms"]
+    assert restored.search_index.search("intro") == ["data_structures", "algorithms"]
+    scheduler = restored.student_scheduler
+    assert scheduler.next_for("s1", "data_structures").sequence_id == "ds_ll"
+    assert scheduler.next_task("s2") == original.student_scheduler.next_task("s2")
+
+    # Restored objects keep working for writes
+    restored.trie.insert("Graphs", "graphs")
+    assert restored.trie.autocomplete("gra") == ["graphs"]
+    scheduler.complete("s1", "data_structures", "ds_ll")
+    assert scheduler.next_for("s1", "data_structures") is None
+
+
+def test_snapshot_is_invalidated_when_catalog_changes(tmp_path):
+    path = str(tmp_path / "platform.snapshot")
+    save_snapshot(path, build_snapshot())
+
+    courses = seed_example_data()
+    courses["algorithms"].add_sequence(
+        Sequence("alg_graphs", "Graphs", timedelta(hours=1), 2)
+    )
+
+    assert load_snapshot(path, courses) is None
+
+
+def test_corrupted_or_missing_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "platform.snapshot"
+    assert load_snapshot(str(path), seed_example_data()) is None
+
+    save_snapshot(str(path), build_snapshot())
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert load_snapshot(str(path), seed_example_data()) is None
+
+
+class RetiredScheduler:
+    """Stands in for a class that a later code version no longer has."""
+
+
+def test_snapshot_with_missing_class_is_ignored(tmp_path, monkeypatch):
+    path = str(tmp_path / "platform.snapshot")
+    snapshot = build_snapshot()
+    snapshot.student_scheduler = RetiredScheduler()
+    save_snapshot(path, snapshot)
+
+    monkeypatch.delattr(sys.modules[__name__], "RetiredScheduler")
+
+    assert load_snapshot(path, seed_example_data()) is None
+
+
+def test_snapshot_of_unexpected_type_is_ignored(tmp_path):
+    path = str(tmp_path / "platform.snapshot")
+    save_snapshot(path, SimpleNamespace(courses=seed_example_data()))
+
+    assert load_snapshot(path, seed_example_data()) is None
+
+
+def test_snapshot_from_different_code_schema_is_ignored(tmp_path, monkeypatch):
+    path = str(tmp_path / "platform.snapshot")
+    save_snapshot(path, build_snapshot())
+
+    monkeypatch.setattr(snapshot_module, "schema_fingerprint", lambda: b"changed")
+
+    assert load_snapshot(path, seed_example_data()) is None
+
+
+def test_snapshot_is_invalidated_when_settings_change(tmp_path):
+    path = str(tmp_path / "platform.snapshot")
+    settings = {"search_backend": "trie", "search_cache_size": 8}
+    save_snapshot(path, build_snapshot(), settings)
+
+    assert load_snapshot(path, seed_example_data(), dict(settings)) is not None
+    assert load_snapshot(path, seed_example_data()) is None
+    changed = dict(settings, search_cache_size=64)
+    assert load_snapshot(path, seed_example_data(), changed) is None
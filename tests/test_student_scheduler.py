@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+
+from core.models.course import Course
+from core.models.sequence import Sequence
+from core.scheduling.student_scheduler import StudentScheduler
+
+
+def make_course(course_id: str, difficulty: int, count: int) -> Course:
+    course = Course(
+        id=course_id,
+        title=course_id.title(),
+        description=f"Course {course_id}",
+        difficulty=difficulty,
+    )
+    for i in range(count):
+        course.add_sequence(
+            Sequence(f"{course_id}_{i}", f"Part {i}", timedelta(hours=1), i)
+        )
+    return course
+
+
+def build_scheduler() -> StudentScheduler:
+    return StudentScheduler.from_courses(
+        [make_course("algorithms", 3, 3), make_course("data_structures", 2, 2)]
+    )
+
+
+def test_students_progress_independently_over_shared_templates():
+    scheduler = build_scheduler()
+
+    scheduler.complete("alice", "algorithms", "algorithms_0")
+
+    assert scheduler.next_for("alice", "algorithms").sequence_id == "algorithms_1"
+    assert scheduler.next_for("bob", "algorithms").sequence_id == "algorithms_0"
+    # Both students see the same shared task objects
+    assert scheduler.next_for("bob", "algorithms") is scheduler.next_for(
+        "carol", "algorithms"
+    )
+    assert not scheduler.has_student("bob")
+
+
+def test_out_of_order_completion_and_finish():
+    scheduler = build_scheduler()
+
+    scheduler.complete("alice", "algorithms", "algorithms_2")
+    assert scheduler.next_for("alice", "algorithms").sequence_id == "algorithms_0"
+
+    scheduler.complete("alice", "algorithms", "algorithms_0")
+    scheduler.complete("alice", "algorithms", "algorithms_1")
+    assert scheduler.next_for("alice", "algorithms") is None
+
+
+def test_next_task_uses_priority_overrides():
+    scheduler = build_scheduler()
+
+    # data_structures has the lower difficulty, so it comes first by default
+    assert scheduler.next_task("alice").course_id == "data_structures"
+
+    scheduler.set_priority("alice", "algorithms", 1)
+    assert scheduler.next_task("alice").course_id == "algorithms"
+    assert scheduler.next_task("bob").course_id == "data_structures"
+    assert scheduler.next_task("alice", ["data_structures"]).sequence_id == (
+        "data_structures_0"
+    )
+
+
+def test_load_completed_seeds_cursors():
+    scheduler = build_scheduler()
+
+    scheduler.load_completed(
+        "alice", ["data_structures_0", "data_structures_1", "algorithms_0", "x"]
+    )
+
+    assert scheduler.next_for("alice", "data_structures") is None
+    assert scheduler.next_task("alice").sequence_id == "algorithms_1"
+
+
+def test_unknown_course_or_sequence_raises():
+    scheduler = build_scheduler()
+
+    with pytest.raises(KeyError):
+        scheduler.next_for("alice", "missing")
+    with pytest.raises(KeyError):
+        scheduler.complete("alice", "algorithms", "data_structures_0")
@@ -1,3 +1,6 @@
+import gc
+
+import pytest
 
 from core.search.trie import ContentTrie
 
@@ -76,3 +79,314 @@ def test_inserting_multiple_values_for_same_key():
     assert len(results) == 2
     assert "Dynamic Programming - Basics" in results
     assert "Dynamic Programming - Advanced" in results
+
+
+def test_autocomplete_limit_stops_early():
+    trie = ContentTrie()
+    for i in range(50):
+        trie.insert(f"course {i:02d}", f"Course {i:02d}")
+
+    results = trie.autocomplete("course", limit=5)
+    assert len(results) == 5
+    assert all(r.startswith("Course") for r in results)
+    assert trie.autocomplete("course", limit=0) == []
+    assert len(trie.autocomplete("", limit=100)) == 50
+
+
+def test_ranked_autocomplete_orders_by_weight():
+    trie = ContentTrie(top_k=2)
+    trie.insert("graphs", "Graphs", weight=1)
+    trie.insert("graph theory", "Graph Theory", weight=10)
+    trie.insert("greedy", "Greedy Algorithms", weight=5)
+    trie.insert("grammars", "Grammars", weight=5)
+
+    # Served from the cached best-k list
+    assert trie.autocomplete("gr", limit=2, ranked=True) == [
+        "Graph Theory",
+        "Greedy Algorithms",
+    ]
+    # Limit above top_k falls back to a full ranked traversal;
+    # equal weights keep insertion order.
+    assert trie.autocomplete("gr", limit=3, ranked=True) == [
+        "Graph Theory",
+        "Greedy Algorithms",
+        "Grammars",
+    ]
+    assert trie.autocomplete("graph", ranked=True) == ["Graph Theory", "Graphs"]
+
+
+def test_iter_autocomplete_is_lazy_and_handles_deep_keys():
+    trie = ContentTrie()
+    deep_key = "a" * 5000  # deeper than the default recursion limit
+    trie.insert(deep_key, "deep")
+    trie.insert("ab", "shallow")
+
+    assert list(trie.iter_autocomplete("a")) == ["deep", "shallow"]
+    assert trie.autocomplete("", ranked=True) == ["deep", "shallow"]
+
+    iterator = trie.iter_autocomplete("")
+    assert next(iterator) == "deep"
+
+
+def test_autocomplete_page_walks_all_results_with_cursor():
+    trie = ContentTrie()
+    for i in range(23):
+        trie.insert(f"topic {i:02d}", f"Topic {i:02d}")
+    trie.insert("topic 05", "Topic 05 - Extra")
+
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = trie.autocomplete_page("Topic", page_size=5, cursor=cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+
+    flat = [value for page in pages for value in page]
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 4]
+    assert flat == trie.autocomplete("topic")
+    assert flat[5:7] == ["Topic 05", "Topic 05 - Extra"]
+
+
+def test_cursor_survives_insertions_before_and_after_it():
+    trie = ContentTrie()
+    for word in ["bfs", "binary search", "bubble sort"]:
+        trie.insert(word, word)
+
+    page, cursor = trie.autocomplete_page("b", page_size=1)
+    assert page == ["bfs"]
+
+    trie.insert("backtracking", "backtracking")  # sorts before the cursor
+    trie.insert("bucket sort", "bucket sort")  # sorts after the cursor
+
+    assert list(trie.iter_autocomplete("b", after=cursor)) == [
+        "binary search",
+        "bubble sort",
+        "bucket sort",
+    ]
+
+
+def test_cursor_rejected_for_other_prefix():
+    trie = ContentTrie()
+    trie.insert("heap", "heap")
+    trie.insert("hash", "hash")
+    _, cursor = trie.autocomplete_page("h", page_size=1)
+
+    with pytest.raises(ValueError):
+        trie.autocomplete_page("ha", cursor=cursor)
+
+
+def test_search_fuzzy_tolerates_typos_and_ranks_by_distance():
+    trie = ContentTrie()
+    trie.insert("algorithms", "Algorithms")
+    trie.insert("algorithm", "Algorithm - Singular")
+    trie.insert("logarithms", "Logarithms")
+    trie.insert("arrays", "Arrays")
+
+    assert trie.autocomplete("algoritms") == []
+    assert trie.search_fuzzy("Algoritms", max_edits=1) == ["Algorithms"]
+    assert trie.search_fuzzy("algoritms", max_edits=2) == [
+        "Algorithms",
+        "Algorithm - Singular",
+    ]
+    assert trie.search_fuzzy("algorithms", max_edits=0) == ["Algorithms"]
+    assert trie.search_fuzzy("xyz", max_edits=1) == []
+
+
+def test_search_fuzzy_limit_keeps_closest_matches():
+    trie = ContentTrie()
+    trie.insert("heap", "heap")
+    trie.insert("heaps", "heaps")
+    trie.insert("help", "help")
+    trie.insert("hash", "hash")
+
+    assert trie.search_fuzzy("heap", max_edits=2, limit=2) == ["heap", "heaps"]
+    assert trie.search_fuzzy("heap", max_edits=2, limit=3) == [
+        "heap",
+        "heaps",
+        "help",
+    ]
+
+
+def test_reinserting_same_pair_does_not_duplicate():
+    trie = ContentTrie()
+    for _ in range(3):
+        trie.insert("arrays", "Arrays - Intro")
+
+    assert trie.autocomplete("arr") == ["Arrays - Intro"]
+
+
+def test_remove_prunes_empty_branches_and_updates_ranking():
+    trie = ContentTrie(top_k=2)
+    trie.insert("graphs", "Graphs", weight=1)
+    trie.insert("graph theory", "Graph Theory", weight=10)
+    trie.insert("greedy", "Greedy", weight=5)
+
+    assert trie.remove("Graph Theory", "Graph Theory") is True
+    assert trie.remove("graph theory", "Graph Theory") is False
+    assert trie.remove("graphs", "missing value") is False
+
+    assert trie.autocomplete("graph ") == []
+    assert trie.autocomplete("g", limit=2, ranked=True) == ["Greedy", "Graphs"]
+    # The "graph theory" branch below "graph" is gone entirely
+    assert set(trie._find_node("graph").children) == {"s"}
+
+
+def test_replace_moves_value_to_new_key():
+    trie = ContentTrie()
+    trie.insert("intro to graphs", "course-42", weight=3)
+    trie.insert("intro to python", "course-7")
+
+    trie.replace("intro to graphs", "graph theory", "course-42")
+
+    assert trie.autocomplete("intro") == ["course-7"]
+    assert trie.autocomplete("graph", ranked=True) == ["course-42"]
+    assert trie._find_node("intro to g") is None
+    with pytest.raises(KeyError):
+        trie.replace("intro to graphs", "graphs", "course-42")
+
+
+def test_autocomplete_cache_counts_hits_and_evicts_lru():
+    trie = ContentTrie(cache_size=2)
+    trie.insert("arrays", "Arrays")
+    trie.insert("graphs", "Graphs")
+
+    assert trie.autocomplete("arr") == ["Arrays"]
+    assert trie.autocomplete("ARR") == ["Arrays"]  # same normalized prefix
+    trie.autocomplete("gr")
+    trie.autocomplete("arr")  # refreshes "arr"
+    trie.autocomplete("", limit=1)  # evicts "gr"
+
+    info = trie.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (2, 3, 1)
+    assert (info.size, info.maxsize) == (2, 2)
+
+    trie.cache_clear()
+    assert trie.cache_info().size == 0
+
+
+def test_mutations_invalidate_cached_results():
+    trie = ContentTrie(cache_size=8)
+    trie.insert("arrays", "Arrays")
+    assert trie.autocomplete("arr") == ["Arrays"]
+
+    trie.insert("arraylist", "ArrayList")
+    assert trie.autocomplete("arr") == ["ArrayList", "Arrays"]
+
+    trie.remove("arrays", "Arrays")
+    assert trie.autocomplete("arr") == ["ArrayList"]
+
+    # Returned lists are copies, so callers cannot corrupt the cache
+    trie.autocomplete("arr").append("junk")
+    assert trie.autocomplete("arr") == ["ArrayList"]
+    assert trie.cache_info().misses == 3
+
+
+def test_from_sorted_matches_incremental_inserts():
+    items = [
+        ("Sorting", "Sorting", 2),
+        ("sort", "Sort", 7),
+        ("search", "Search", 5),
+        ("arrays", "Arrays", 1),
+        ("sort", "Sort - Advanced", 7),
+        ("arrays", "Arrays", 3),  # duplicate pair: only the weight changes
+    ]
+    bulk = ContentTrie.from_sorted(items, top_k=2)
+    incremental = ContentTrie(top_k=2)
+    for key, value, weight in items:
+        incremental.insert(key, value, weight)
+
+    for prefix in ["", "s", "sort", "a", "x"]:
+        assert bulk.autocomplete(prefix) == incremental.autocomplete(prefix)
+        for limit in (1, 2, 3, None):
+            assert bulk.autocomplete(
+                prefix, limit=limit, ranked=True
+            ) == incremental.autocomplete(prefix, limit=limit, ranked=True)
+
+
+def test_bulk_insert_into_existing_trie():
+    trie = ContentTrie()
+    trie.insert("graphs", "Graphs", weight=4)
+    trie.bulk_insert([("graph theory", "Graph Theory"), ("greedy", "Greedy", 9)])
+
+    assert trie.autocomplete("gr") == ["Graph Theory", "Graphs", "Greedy"]
+    assert trie.autocomplete("gr", limit=2, ranked=True) == ["Greedy", "Graphs"]
+
+
+def test_bulk_insert_pauses_gc_only_on_request(monkeypatch):
+    calls = []
+    monkeypatch.setattr(gc, "disable", lambda: calls.append("disable"))
+    monkeypatch.setattr(gc, "enable", lambda: calls.append("enable"))
+    monkeypatch.setattr(gc, "isenabled", lambda: True)
+
+    trie = ContentTrie()
+    trie.bulk_insert([("graphs", "Graphs"), ("greedy", "Greedy")])
+    assert calls == []
+
+    trie.bulk_insert([("trees", "Trees")], pause_gc=True)
+    assert calls == ["disable", "enable"]
+    assert trie.autocomplete("") == ["Graphs", "Greedy", "Trees"]
+
+
+def test_copy_on_write_leaves_running_readers_on_their_snapshot():
+    trie = ContentTrie(copy_on_write=True)
+    for word in ["stack", "string", "struct"]:
+        trie.insert(word, word)
+
+    reader = trie.iter_autocomplete("st")
+    assert next(reader) == "stack"
+
+    trie.insert("stream", "stream")
+    trie.remove("struct", "struct")
+    trie.replace("string", "strings", "string")
+
+    # The in-flight reader keeps seeing the snapshot it started on
+    assert list(reader) == ["string", "struct"]
+    assert trie.autocomplete("st") == ["stack", "stream", "string"]
+    assert trie.autocomplete("strings") == ["string"]
+    assert trie.autocomplete("st", limit=2, ranked=True) == ["stack", "stream"]
+
+
+def test_copy_on_write_concurrent_readers_and_writer():
+    import threading
+
+    trie = ContentTrie.from_sorted(
+        [(f"topic {i:03d}", i) for i in range(100)], copy_on_write=True
+    )
+    errors = []
+    done = threading.Event()
+
+    def read() -> None:
+        while not done.is_set():
+            results = trie.autocomplete("topic")
+            # Every snapshot holds the 100 seed values plus a prefix of the
+            # writer's values, never a torn intermediate state.
+            extra = sorted(v for v in results if v >= 100)
+            if len(results) < 100 or extra != list(range(100, 100 + len(extra))):
+                errors.append(results)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for i in range(100, 300):
+        trie.insert(f"topic {i:03d}", i)
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert len(trie.autocomplete("topic")) == 300
+
+
+def test_unhashable_value_is_rejected_without_changing_trie():
+    trie = ContentTrie()
+    trie.insert("zebra", "Zebra")
+
+    with pytest.raises(TypeError):
+        trie.insert("zz", {"a": 1})
+    with pytest.raises(TypeError):
+        trie.bulk_insert([("zoo", "Zoo"), ("zzz", ["unhashable"])])
+
+    assert trie.autocomplete("z") == ["Zebra"]
+    assert trie._find_node("zz") is None
+    assert trie._find_node("zo") is None